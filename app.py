@@ -10,15 +10,25 @@ from luma.core.interface.serial import spi
 from luma.oled.device import sh1106
 
 from libs.button import Button
+from libs.device.accelerometer import AccelerometerInputDevice
+from libs.device.audio import AudioInputDevice
+from libs.device.beam import BeamBreakInputDevice
+from libs.device.camera import CameraInputDevice
 from libs.device.input import DigitalInputDevice
+from libs.device.intervalometer import IntervalometerInputDevice
+from libs.device.motion import MotionInputDevice
+from libs.device.network import UdpInputDevice
 from libs.device.output import (
     BluetoothOuputDevice,
     ConsoleOutputDevice,
     GPhotoOutputDevice,
+    OptronOutputDevice,
     PinOutputDevice,
     ScreenCounterOutputDevice,
     ScreenOutputDevice,
 )
+from libs.device.sequencer import SequencerOutputDevice
+from libs.device.ultrasonic import GPIOEchoBackend, UltrasonicInputDevice
 from libs.eventbus import EventBusDefaultDict
 from libs.eventtypes import (
     ButtonClickEvent,
@@ -32,23 +42,36 @@ from libs.eventtypes import (
 )
 from libs.helpers import handle_exception, shutdown
 from libs.hwinfo import HWInfo
+from libs.pins import (
+    ACCEL_INT,
+    BUTTON_ENTER,
+    BUTTON_LEFT,
+    BUTTON_RIGHT,
+    DIGITAL_INPUT,
+    EMITTER_OUTPUT,
+    LOOPBACK_INPUT,
+    OPTRON_FOCUS,
+    OPTRON_SHUTTER,
+    RPI0_LED,
+    SONAR_ECHO,
+    SONAR_TRIGGER,
+)
 from libs.router import Router
+from libs.trace import Tracer
 from menu.data import Config
 from menu.oled import OledMenu
 
 logger = logging.getLogger(__name__)
 
-BUTTON_LEFT = 5
-BUTTON_RIGHT = 26
-BUTTON_ENTER = 13
-DIGITAL_INPUT = 22
-RPI0_LED = 29
+AUDIO_INPUT = "default"
+VIDEO_INPUT = "/dev/video0"
 
 
 class Application:
     def __init__(self, loop_debug: bool = False, loop_slow_callback_duration: float = 0.2) -> None:
         self.storage = dbm.open("storage", "c")
         self.config = Config(self.storage)
+        self.tracer = Tracer(enabled=self.config.trace_enable.value)
 
         self.bus = EventBusDefaultDict()
         self.executor = ThreadPoolExecutor()
@@ -76,22 +99,42 @@ class Application:
                 s, lambda s=s: asyncio.create_task(shutdown(self.loop, self.executor, signal=s))
             )
 
+        # kill -USR1 <pid> dumps the trace buffer as Chrome trace-event JSON
+        self.loop.add_signal_handler(signal.SIGUSR1, self.tracer.export)
+
         handle_exc_func = functools.partial(handle_exception, self.executor)
 
         self.loop.set_exception_handler(handle_exc_func)
 
     def setup_devices(self) -> None:
         di_i = DigitalInputDevice(self.config, DIGITAL_INPUT)
+        beam_i = BeamBreakInputDevice(self.config, emitter_pin=EMITTER_OUTPUT, input_pin=DIGITAL_INPUT)
+        audio_i = AudioInputDevice(self.config, device=AUDIO_INPUT)
+        motion_i = MotionInputDevice(self.config, path=VIDEO_INPUT)
+        accel_i = AccelerometerInputDevice(self.config, int_pin=ACCEL_INT)
+        distance_i = UltrasonicInputDevice(self.config, GPIOEchoBackend(SONAR_TRIGGER, SONAR_ECHO))
+        self.udp_i = UdpInputDevice(self.config)
+        timelapse_i = IntervalometerInputDevice(self.config)
 
         c_o = ConsoleOutputDevice(config=self.config)
         scr_o = ScreenOutputDevice(config=self.config, canvas=self.oled_menu.draw)
         scrc_o = ScreenCounterOutputDevice(config=self.config, canvas=self.oled_menu.draw)
 
         led_o = PinOutputDevice(config=self.config, pin=RPI0_LED, inverted=True)
+        optron_o = OptronOutputDevice(config=self.config, focus_pin=OPTRON_FOCUS, shutter_pin=OPTRON_SHUTTER)
         self.bt_o = BluetoothOuputDevice(config=self.config)
         gphoto_o = GPhotoOutputDevice(config=self.config)
+        seq_o = SequencerOutputDevice(config=self.config)
+        output_devices = [c_o, scr_o, scrc_o, led_o, optron_o, self.bt_o, gphoto_o, seq_o]
+
+        camera_i = CameraInputDevice(self.config, camera=self.bt_o, outputs=output_devices)
 
-        self.router = Router(input_devices=[di_i], output_devices=[c_o, scr_o, scrc_o, led_o, self.bt_o, gphoto_o])
+        self.router = Router(
+            config=self.config,
+            input_devices=[di_i, beam_i, audio_i, motion_i, accel_i, distance_i, self.udp_i, camera_i, timelapse_i],
+            output_devices=output_devices,
+            loopback_pin=LOOPBACK_INPUT,
+        )
 
     def setup_buttons(self) -> None:
         self.buttons = [Button(BUTTON_LEFT), Button(BUTTON_RIGHT), Button(BUTTON_ENTER)]
@@ -112,6 +155,7 @@ class Application:
         try:
             self.loop.create_task(self.hwinfo.read_and_reset(1000))
             self.loop.create_task(self.bt_o.search())
+            self.loop.create_task(self.udp_i.start())
             logging.info("Starting the RPiSonyRemote service.")
             self.loop.run_forever()
 
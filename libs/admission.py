@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import math
+import time
+
+from collections.abc import Coroutine
+from typing import Any, Callable, Optional
+
+from libs.eventbus import EventBusDefaultDict
+from libs.eventtypes import AdmissionStatsEvent, ConfigChangeEvent
+from libs.trace import Tracer
+from libs.utils import sleep_until
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_KEYS = (
+    "admission_enable",
+    "admission_rate",
+    "admission_burst",
+    "admission_interval",
+    "admission_defer",
+    "admission_max_delay",
+)
+
+
+class TokenBucket:
+    """Sustained `rate` triggers per second with room for `burst` back-to-back ones.
+
+    Tokens may be taken at a future time, which reserves them: later callers see the bucket
+    as it will be after the reservation. `rate <= 0` disables the rate limit, leaving only
+    `min_interval` seconds between taken tokens.
+    """
+
+    def __init__(self, rate: float, burst: int, min_interval: float = 0.0) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.min_interval = min_interval
+        self.tokens = float(self.burst)
+        self.updated_at: Optional[float] = None
+        self.last_taken: Optional[float] = None
+
+    def _tokens_at(self, at: float) -> float:
+        if self.updated_at is None or self.rate <= 0:
+            return float(self.burst)
+        return min(self.burst, self.tokens + max(at - self.updated_at, 0) * self.rate)
+
+    def ready_at(self, now: float) -> float:
+        """Earliest time at or after `now` when a token can be taken."""
+
+        at = now if self.updated_at is None else max(now, self.updated_at)
+        tokens = self._tokens_at(at)
+        if tokens < 1:
+            at += (1 - tokens) / self.rate
+        if self.last_taken is not None:
+            at = max(at, self.last_taken + self.min_interval)
+        return at
+
+    def take(self, at: float) -> None:
+        self.tokens = self._tokens_at(at) - 1
+        self.updated_at = at if self.updated_at is None else max(at, self.updated_at)
+        self.last_taken = at
+
+
+class AdmissionControl:
+    """Admission stage between the input devices and `Router`.
+
+    Shutter edges are admitted while the token bucket allows them. Otherwise they are dropped,
+    or, with `admission_defer`, delivered later at the earliest allowed time unless that is more
+    than `admission_max_delay` ms away. Release edges follow the fate of their shutter edge,
+    so outputs always see matching pairs in order.
+    """
+
+    def __init__(self, config: Config, target: Callable[[bool], Coroutine[Any, Any, None]]) -> None:
+        self.config = config
+        self.target = target
+        self.admitted = 0
+        self.deferred = 0
+        self.dropped = 0
+        self._drop_release = False
+        self._chain: Optional[asyncio.Task[None]] = None  # last deferred delivery, later edges queue behind it
+        self._deliveries: set[asyncio.Task[None]] = set()
+        self.tracer = Tracer()
+        self.update_settings()
+
+        self.bus = EventBusDefaultDict()
+        self.bus.add_listener(ConfigChangeEvent, self.on_config_change)
+
+    def update_settings(self) -> None:
+        self.enabled: bool = self.config.admission_enable.value
+        self.defer: bool = self.config.admission_defer.value
+        self.max_delay: float = self.config.admission_max_delay.value / 1000
+        self.bucket = TokenBucket(
+            rate=self.config.admission_rate.value,
+            burst=self.config.admission_burst.value,
+            min_interval=self.config.admission_interval.value / 1000,
+        )
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key in ADMISSION_KEYS:
+            self.update_settings()
+
+    async def notify_callback(self, value: bool) -> None:
+        # inputs other than DigitalInputDevice start their trace here
+        self.tracer.ensure_trace()
+        if not self.enabled:
+            await self.target(value)
+            return
+
+        now = time.monotonic()
+        queued = self._chain is not None and not self._chain.done()
+
+        if not value:
+            if self._drop_release:
+                self._drop_release = False
+            elif queued:
+                self._chain = asyncio.create_task(self._deliver_at(self._chain, now, False))
+            else:
+                await self.target(False)
+            return
+
+        at = self.bucket.ready_at(now)
+        if at <= now and not queued:
+            self.bucket.take(now)
+            self.admitted += 1
+            self.publish()
+            await self.target(True)
+            return
+
+        if not self.defer or at - now > self.max_delay or math.isinf(at):
+            self.dropped += 1
+            self._drop_release = True
+            self.tracer.instant("AdmissionControl.drop")
+            logger.debug(f"AdmissionControl dropped a trigger, next slot in {(at - now) * 1000:.1f} ms")
+            self.publish()
+            return
+
+        self.bucket.take(at)
+        self.deferred += 1
+        self.tracer.instant("AdmissionControl.defer", delay_ms=(at - now) * 1000)
+        self._drop_release = False
+        self.publish()
+        self._chain = asyncio.create_task(self._deliver_at(self._chain if queued else None, at, True))
+
+    async def _deliver_at(self, previous: Optional[asyncio.Task[None]], at: float, value: bool) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+
+        await sleep_until(at)
+
+        if value:
+            self.admitted += 1
+            self.publish()
+
+        # edges behind this one wait for its delivery to start, not for the shutter it triggers
+        delivery = asyncio.create_task(self.target(value))
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._delivered)
+
+    def _delivered(self, task: asyncio.Task[None]) -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.exception("AdmissionControl deferred delivery failed", exc_info=task.exception())
+
+    def publish(self) -> None:
+        self.bus.emit(
+            AdmissionStatsEvent(admitted=self.admitted, deferred=self.deferred, dropped=self.dropped), no_log=True
+        )
@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import time
+
+from typing import NamedTuple, Optional
 
 from bleak import BleakScanner
 from bleak.backends.device import BLEDevice
@@ -32,27 +36,58 @@ S_READY = b"\x02\xA0\x00"  # Shutter Ready (half up in bulb or done in fixed shu
 F_LOST = b"\x02\x3F\x00"  # Focus Lost (up)
 
 
-async def get_sony_device(timeout: int = 5) -> list[tuple[BLEDevice, AdvertisementData]]:
-    res = []
+SONY_COMPANY_ID = 301  # 0x012D, key of Sony's manufacturer specific advertisement data
+SONY_CAMERA = 0x0003  # product type of cameras, headphones and phones share the company id
+
+
+class SonyCamera(NamedTuple):
+    address: str
+    name: Optional[str]  # advertised name, e.g. "ILCE-7C"
+    model_code: int  # from the manufacturer data, tells models apart even without a name
+
+    @property
+    def model(self) -> str:
+        return self.name or f"Sony camera 0x{self.model_code:04x}"
+
+
+cameras: dict[str, SonyCamera] = {}  # by address, every camera seen by a scan
+
+
+def decode_sony_camera(device: BLEDevice, adv: AdvertisementData) -> Optional[SonyCamera]:
+    """The camera in a Sony advertisement: product type and model code, 2 bytes each, little endian."""
+
+    payload = adv.manufacturer_data.get(SONY_COMPANY_ID)
+    if payload is None or len(payload) < 4 or int.from_bytes(payload[0:2], "little") != SONY_CAMERA:
+        return None
+
+    return SonyCamera(device.address, adv.local_name or device.name, int.from_bytes(payload[2:4], "little"))
+
+
+async def get_sony_device(timeout: float = 5) -> list[tuple[BLEDevice, AdvertisementData]]:
+    """Scans until the first Sony camera advertises, at most `timeout` s."""
+
+    found: asyncio.Future[tuple[BLEDevice, AdvertisementData]] = asyncio.get_running_loop().create_future()
 
-    devices = await BleakScanner.discover(timeout=timeout, return_adv=True)
+    def detected(device: BLEDevice, adv: AdvertisementData) -> None:
+        camera = decode_sony_camera(device, adv)
+        if camera is None:
+            return
 
-    for device, adv in devices.values():
-        logger.debug(f"{device.name} [{device.address}]")
-        if device.name == "ILCE-7C":
-            logger.debug(f"device: {device}")
-            logger.debug(f"\taddress: {device.address}")
-            logger.debug(f"\tdetails: {device.details}")
-            logger.debug(f"\tname: {device.name}")
-            logger.debug(f"\tadv: {adv}")
-            logger.debug(f"\t\tlocal_name: {adv.local_name}")
-            logger.debug(f"\t\tmanufacturer_data: {adv.manufacturer_data}")
-            logger.debug(f"\t\tplatform_data: {adv.platform_data}")
-            logger.debug(f"\t\trssi: {adv.rssi}")
-            logger.debug(f"\t\tservice_data: {adv.service_data}")
-            logger.debug(f"\t\tservice_uuids: {adv.service_uuids}")
-            logger.debug(f"\t\ttx_power: {adv.tx_power}")
+        if device.address not in cameras:
+            logger.debug(
+                f"{camera.model} [{device.address}] rssi {adv.rssi}, manufacturer_data {adv.manufacturer_data}"
+            )
+        cameras[device.address] = camera
+        if not found.done():
+            found.set_result((device, adv))
 
-            res.append((device, adv))
+    started_at = time.monotonic()
+    async with BleakScanner(detection_callback=detected):
+        try:
+            device, adv = await asyncio.wait_for(found, timeout)
+        except asyncio.TimeoutError:
+            logger.debug(f"No Sony camera advertised in {timeout} s")
+            return []
 
-    return res
+    logger.info(f"Found {cameras[device.address].model} [{device.address}] in {time.monotonic() - started_at:.2f} s")
+    return [(device, adv)]
@@ -0,0 +1,164 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from libs.ble.utils import AFD, AFU, C1D, C1U, FIB, FOB, REC, RET, SFD, SFU, SHD, SHU
+from libs.utils import summarize
+
+logger = logging.getLogger(__name__)
+
+SHUTTER = 0
+FOCUS = 1
+ZOOM = 2
+
+PRIORITIES = {
+    SHU: SHUTTER,
+    SHD: SHUTTER,
+    SFU: SHUTTER,
+    SFD: SHUTTER,
+    REC: SHUTTER,
+    RET: SHUTTER,
+    C1U: SHUTTER,
+    C1D: SHUTTER,
+    AFU: FOCUS,
+    AFD: FOCUS,
+    FIB[:2]: FOCUS,
+    FOB[:2]: FOCUS,
+}  # everything else, i.e. the zoom step commands, goes last
+
+
+def command_priority(command: bytes) -> int:
+    return PRIORITIES.get(command, PRIORITIES.get(command[:2], ZOOM))
+
+
+def is_step(command: bytes) -> bool:
+    return len(command) == 3 and command[0] == 0x02
+
+
+class Entry:
+    def __init__(self, commands: tuple[bytes, ...], future: asyncio.Future[None]) -> None:
+        self.commands = commands
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.started = False
+        self.waiters = 0  # senders waiting for it, coalesced ones included
+
+
+class CommandWriter:
+    """The only path to the remote's command characteristic: one writer task draining a priority queue.
+
+    Shutter commands go before focus, focus before zoom; a command already being written is not
+    interrupted. A step command (focus/zoom) still waiting in the queue is replaced by a newer one of
+    the same kind instead of queueing both; the commands are only taken back once every sender waiting
+    for them is cancelled. The commands of one `send` are written back to back with nothing in between,
+    without waiting for the write response except on the last one when the characteristic allows that.
+    Queue wait and write time are kept per command.
+    """
+
+    def __init__(self, write: Callable[[bytes, bool], Awaitable[None]], size: int = 100) -> None:
+        self._write = write  # (command, response)
+        self.without_response = False  # the characteristic supports write without response
+        self.queue: asyncio.PriorityQueue[tuple[int, int, Entry]] = asyncio.PriorityQueue()
+        self.coalesced = 0
+        self.waits: dict[bytes, deque[float]] = {}  # s from send to the start of the write
+        self.writes: dict[bytes, deque[float]] = {}  # s the write took
+        self.size = size
+        self._order = itertools.count()
+        self._steps: dict[bytes, Entry] = {}  # queued step commands by kind
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def send(self, *commands: bytes) -> None:
+        """Queues `commands` as one sequence, at the priority of the first, and waits until written."""
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+        if len(commands) == 1 and is_step(commands[0]):
+            queued = self._steps.get(commands[0][:2])
+            if queued is not None and not queued.started and not queued.future.done():
+                queued.commands = commands
+                self.coalesced += 1
+                await self.wait(queued)
+                return
+
+        entry = Entry(commands, asyncio.get_running_loop().create_future())
+        if len(commands) == 1 and is_step(commands[0]):
+            self._steps[commands[0][:2]] = entry
+        self.queue.put_nowait((command_priority(commands[0]), next(self._order), entry))
+        await self.wait(entry)
+
+    async def wait(self, entry: Entry) -> None:
+        entry.waiters += 1
+        try:
+            await asyncio.shield(entry.future)
+        finally:
+            entry.waiters -= 1
+            # cancelling the last sender takes the commands back, unless they are being written already
+            if not entry.waiters:
+                entry.future.cancel()
+
+    def stop(self) -> None:
+        """Stops the writer task, senders still waiting get a ConnectionError. The next `send` starts it again."""
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        while not self.queue.empty():
+            _, _, entry = self.queue.get_nowait()
+            if not entry.future.done():
+                entry.future.set_exception(ConnectionError("CommandWriter stopped"))
+        self._steps.clear()
+
+    async def run(self) -> None:
+        while True:
+            _, _, entry = await self.queue.get()
+            entry.started = True
+            for command in entry.commands:
+                if self._steps.get(command[:2]) is entry:
+                    del self._steps[command[:2]]
+            if entry.future.cancelled():
+                continue
+
+            started_at = time.monotonic()
+            try:
+                for i, command in enumerate(entry.commands):
+                    response = i == len(entry.commands) - 1 or not self.without_response
+                    await self._write(command, response)
+                    written_at = time.monotonic()
+                    self.record(command, started_at - entry.enqueued_at, written_at - started_at)
+                    started_at = written_at
+            except asyncio.CancelledError:
+                if not entry.future.done():
+                    entry.future.set_exception(ConnectionError("CommandWriter stopped"))
+                raise
+            except Exception as e:
+                if not entry.future.done():
+                    entry.future.set_exception(e)
+            else:
+                if not entry.future.done():
+                    entry.future.set_result(None)
+
+    def record(self, command: bytes, wait: float, write: float) -> None:
+        key = command[:2] if is_step(command) else command
+        self.waits.setdefault(key, deque(maxlen=self.size)).append(wait)
+        self.writes.setdefault(key, deque(maxlen=self.size)).append(write)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """p50 and max queue wait and write time per command, in ms."""
+
+        summary = {}
+        for key, waits in self.waits.items():
+            wait, write = summarize(waits, 1000), summarize(self.writes[key], 1000)
+            summary[key.hex()] = {
+                "count": wait["count"],
+                "wait_p50": wait["p50"],
+                "wait_max": wait["max"],
+                "write_p50": write["p50"],
+                "write_max": write["max"],
+            }
+        return summary
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from typing import Any, Optional
+
+import RPi.GPIO as GPIO
+
+from libs.device.output import OutputDevice
+from libs.utils import summarize
+
+logger = logging.getLogger(__name__)
+
+
+def latency_key(device: OutputDevice) -> str:
+    return f"latency:{device.__class__.__name__}"
+
+
+def load_latency(storage: Any, device: OutputDevice) -> float:
+    """Calibrated trigger-to-effect latency of `device` in seconds, 0 when it was never calibrated."""
+
+    raw = storage.get(latency_key(device))
+    return json.loads(raw)["p50"] / 1000 if raw else 0.0
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """`summarize` in ms, with the spread of the shots."""
+
+    return {**summarize(latencies, 1000), "stdev": statistics.pstdev(latencies) * 1000}
+
+
+class LoopbackProbe:
+    """An input pin wired to an output line (or a photodiode watching the flash), reports rising edges
+    as the effect of the device being calibrated."""
+
+    def __init__(self, pin: int) -> None:
+        self.pin = pin
+        self.device: Optional[OutputDevice] = None
+        self.loop = asyncio.get_event_loop()
+
+    def attach(self, device: OutputDevice) -> None:
+        self.device = device
+        GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        GPIO.add_event_detect(self.pin, GPIO.RISING, callback=self._callback)
+
+    def detach(self) -> None:
+        GPIO.remove_event_detect(self.pin)
+        GPIO.cleanup(self.pin)
+        self.device = None
+
+    def _callback(self, channel: int) -> None:
+        timestamp = time.monotonic()
+        if self.device is not None:
+            self.loop.call_soon_threadsafe(self.device.mark_effect, timestamp)
+
+
+async def measure_latency(
+    device: OutputDevice, shots: int = 10, timeout: float = 2.0, interval: float = 0.5, lead: float = 0.05
+) -> list[float]:
+    """Fires `device` `shots` times at a known deadline and collects deadline-to-effect latencies."""
+
+    latencies = []
+    for _ in range(shots):
+        device.effect_at = None
+        device.effect_seen.clear()
+        deadline = time.monotonic() + lead
+        await device.trigger(True, deadline=deadline)
+        try:
+            await asyncio.wait_for(device.effect_seen.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{device.__class__.__name__} calibration shot saw no effect in {timeout} s")
+        else:
+            latencies.append(device.effect_at - deadline)  # type: ignore
+        await device.trigger(False)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def calibrate(
+    storage: Any, devices: list[OutputDevice], loopback: Optional[LoopbackProbe] = None, shots: int = 10
+) -> dict[str, dict[str, float]]:
+    """Measures every device that can observe its own effect and stores the results in `storage`.
+
+    Loopback devices share one probe, so only one of them should be enabled (and wired) per run.
+    """
+
+    results = {}
+    for device in devices:
+        if device.effect_source is None or (device.effect_source == "loopback" and loopback is None):
+            continue
+
+        name = device.__class__.__name__
+        logger.info(f"Calibrating {name} latency, {shots} shots via {device.effect_source}")
+        if device.effect_source == "loopback":
+            loopback.attach(device)  # type: ignore
+        try:
+            latencies = await measure_latency(device, shots=shots)
+        finally:
+            if device.effect_source == "loopback":
+                loopback.detach()  # type: ignore
+
+        if not latencies:
+            logger.error(f"{name} calibration failed, the stored latency is kept")
+            continue
+
+        results[name] = summarize_latencies(latencies)
+        storage[latency_key(device)] = json.dumps(results[name])
+        logger.info(f"{name} latency: {results[name]}")
+
+    return results
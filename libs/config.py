@@ -102,12 +102,35 @@ class Config(metaclass=ConfigMeta):
     digital_trigger_enable = ConfigItem[bool]("D.Enable", ParamType.BOOL, True, "wave-square")
     digital_trigger_direction = ConfigItem[bool]("D.Above", ParamType.BOOL, True, "arrow-up-from-dotted-line")
     digital_emmitter_enable = ConfigItem[bool]("Emmitter", ParamType.BOOL, False, "signal-stream")
+    audio_trigger_enable = ConfigItem[bool]("Sound", ParamType.BOOL, False, "microphone")
+    audio_trigger_threshold = ConfigItem[int]("S.Level", ParamType.INT, 30, "volume-high")
+    audio_block_size = ConfigItem[int]("S.Block", ParamType.INT, 512, "bars-progress")
+    motion_trigger_enable = ConfigItem[bool]("Motion", ParamType.BOOL, False, "person-running")
+    motion_threshold = ConfigItem[int]("M.Level", ParamType.INT, 25, "eye")
+    motion_area = ConfigItem[int]("M.Area", ParamType.INT, 2, "crosshairs")
+    vibration_trigger_enable = ConfigItem[bool]("Vibration", ParamType.BOOL, False, "house-crack")
+    vibration_threshold = ConfigItem[int]("V.Level", ParamType.INT, 300, "explosion")
+    distance_trigger_enable = ConfigItem[bool]("Distance", ParamType.BOOL, False, "ruler")
+    distance_near = ConfigItem[int]("R.Near", ParamType.INT, 10, "arrows-to-dot")
+    distance_far = ConfigItem[int]("R.Far", ParamType.INT, 50, "ruler-horizontal")
+    udp_trigger_enable = ConfigItem[bool]("Network", ParamType.BOOL, False, "wifi")
+    udp_port = ConfigItem[int]("UDP Port", ParamType.INT, 5005, "ethernet")
+    camera_trigger_enable = ConfigItem[bool]("Camera", ParamType.BOOL, False, "camera-retro")
+    intervalometer_enable = ConfigItem[bool]("Timelapse", ParamType.BOOL, False, "business-time")
+    intervalometer_interval = ConfigItem[int]("T.Interval", ParamType.INT, 5000, "hourglass-start")  # ms
+    intervalometer_frames = ConfigItem[int]("T.Frames", ParamType.INT, 0, "images")
 
     # outputs
     optron_enable = ConfigItem[bool]("Pin Out", ParamType.BOOL, False, "outlet")
+    optron_prefocus = ConfigItem[bool]("Pre-Focus", ParamType.BOOL, False, "circle-dot")
+    optron_focus_time = ConfigItem[int]("Focus Time", ParamType.INT, 300, "stopwatch")  # ms
     oled_blink_enable = ConfigItem[bool]("Blink Screen", ParamType.BOOL, False, "display")
     led_timer_enable = ConfigItem[bool]("Screen Timer", ParamType.BOOL, False, "input-numeric")
+    oled_timer_fps = ConfigItem[int]("Timer FPS", ParamType.INT, 10, "gauge")
     led_blink_enable = ConfigItem[bool]("Blink LED", ParamType.BOOL, False, "lightbulb")
+    pin_precise_enable = ConfigItem[bool]("Precise Pin", ParamType.BOOL, False, "bullseye")
+    sequencer_enable = ConfigItem[bool]("Sequencer", ParamType.BOOL, False, "timeline")
+    sequencer_preset = ConfigItem[int]("Seq.Preset", ParamType.INT, 1, "list-ol")
     console_enable = ConfigItem[bool]("Console Log", ParamType.BOOL, False, "terminal")
     gphoto_enable = ConfigItem[bool]("USB GPhoto", ParamType.BOOL, False, "plug")
 
@@ -115,6 +138,17 @@ class Config(metaclass=ConfigMeta):
     shutter_lag = ConfigItem[int]("Shut.Delay", ParamType.INT, 0, "chess-clock-flip")
     release_lag = ConfigItem[int]("Relz.Delay", ParamType.INT, 60, "chess-clock")
     trigger_read_timer = ConfigItem[int]("ReadTimer", ParamType.INT, 60, "clock")
+    sync_fire_enable = ConfigItem[bool]("Sync Fire", ParamType.BOOL, False, "link")
+    skew_compensation_enable = ConfigItem[bool]("Skew Comp", ParamType.BOOL, True, "scale-balanced")
+    predict_enable = ConfigItem[bool]("Predict", ParamType.BOOL, False, "chart-line")
+    latency_calibrate = ConfigItem[bool]("Calibrate", ParamType.BOOL, False, "ruler-combined")
+    retrigger_policy = ConfigItem[int]("Retrigger", ParamType.INT, 0, "repeat")  # see RetriggerPolicy
+    admission_enable = ConfigItem[bool]("Rate Limit", ParamType.BOOL, False, "filter")
+    admission_rate = ConfigItem[float]("Max Rate", ParamType.FLOAT, 2.0, "gauge-high")  # shots per second
+    admission_burst = ConfigItem[int]("Burst", ParamType.INT, 3, "layer-group")
+    admission_interval = ConfigItem[int]("Min Gap", ParamType.INT, 0, "arrows-left-right-to-line")  # ms
+    admission_defer = ConfigItem[bool]("Defer", ParamType.BOOL, False, "hourglass-half")
+    admission_max_delay = ConfigItem[int]("Max Defer", ParamType.INT, 1000, "hourglass-end")  # ms
 
     # macro
     macro_enable = ConfigItem[bool]("Use Macro", ParamType.BOOL, False, "flower-tulip")
@@ -130,11 +164,14 @@ class Config(metaclass=ConfigMeta):
     # settings
     night_mode = ConfigItem[bool]("Night Mode", ParamType.BOOL, False, "moon")
     hwinfo_enable = ConfigItem[bool]("HWInfo", ParamType.BOOL, False, "microchip")
+    trace_enable = ConfigItem[bool]("Tracing", ParamType.BOOL, False, "route")
 
     # bt
     bt_enable = ConfigItem[bool]("Enable BT", ParamType.BOOL, False, "bluetooth-b")
     bt_bulb = ConfigItem[bool]("BULB mode", ParamType.BOOL, False, "hand-point-down")
     bt_af_enable = ConfigItem[bool]("Enable AF", ParamType.BOOL, False, "users-viewfinder")
+    bt_armed = ConfigItem[bool]("Armed AF", ParamType.BOOL, False, "lock")
+    bt_burst = ConfigItem[int]("Burst", ParamType.INT, 1, "film")
 
     def __init__(self, storage: Any) -> None:
         self.storage = storage
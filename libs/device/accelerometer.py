@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import threading
+import time
+
+from typing import Any, Optional
+
+import numpy as np
+import RPi.GPIO as GPIO
+import smbus
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+# ADXL345 registers
+DEVID = 0x00
+BW_RATE = 0x2C
+POWER_CTL = 0x2D
+INT_ENABLE = 0x2E
+INT_MAP = 0x2F
+INT_SOURCE = 0x30
+DATA_FORMAT = 0x31
+DATAX0 = 0x32
+FIFO_CTL = 0x38
+FIFO_STATUS = 0x39
+
+ADXL345_DEVID = 0xE5
+MEASURE = 0x08
+WATERMARK = 0x02
+FULL_RES = 0x08
+FIFO_STREAM = 0x80
+FIFO_DEPTH = 32
+ENTRY_SIZE = 6  # x, y, z as int16 little endian
+G_PER_LSB = 0.0039  # full resolution mode, any range
+
+RATE_CODES = {3200: 0x0F, 1600: 0x0E, 800: 0x0D, 400: 0x0C, 200: 0x0B, 100: 0x0A}
+RANGE_CODES = {2: 0x00, 4: 0x01, 8: 0x02, 16: 0x03}
+
+
+def decode_fifo(raw: bytes) -> np.ndarray:
+    """Converts concatenated FIFO entries into an (n, 3) array of accelerations in g."""
+
+    counts = np.frombuffer(raw, dtype="<i2", count=len(raw) // ENTRY_SIZE * 3)
+    samples: np.ndarray = counts.reshape(-1, 3) * G_PER_LSB
+    return samples
+
+
+class AccelerometerInputDevice(InputDevice):
+    """Knock/vibration trigger on an ADXL345 with its FIFO in stream mode.
+
+    The sensor raises INT1 when `watermark` samples are queued; the whole FIFO is then drained
+    and evaluated as one batch: the trigger fires when the vector magnitude deviates from
+    the gravity baseline by more than the configured threshold (mg) anywhere in the batch.
+    Without `int_pin` the FIFO is drained on a timer sized to the watermark.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        bus: Optional[Any] = None,
+        address: int = 0x53,
+        int_pin: Optional[int] = None,
+        rate: int = 800,
+        g_range: int = 16,
+        watermark: int = 16,
+        release_ratio: float = 0.5,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.smbus = bus
+        self.address = address
+        self.int_pin = int_pin
+        self.rate = rate
+        self.g_range = g_range
+        self.watermark = min(max(watermark, 1), FIFO_DEPTH - 1)
+        self.release_ratio = release_ratio
+
+        self.threshold = self.config.vibration_threshold.value / 1000
+        self.baseline = 1.0  # g, tracked from the batch means
+        self.last_batch_peak = 0.0
+        self.last_trigger: Optional[float] = None
+        self.samples_read = 0
+        self._active = False
+        self._running = False  # sensor set up and being read
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.vibration_trigger_enable.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self._running:
+            return
+
+        try:
+            if self.smbus is None:
+                self.smbus = smbus.SMBus(1)
+            self.setup_sensor(self.smbus)
+        except Exception as e:
+            logger.exception(e)
+            return
+
+        self._running = True
+        self._stop.clear()
+        if self.int_pin is not None:
+            GPIO.setup(self.int_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+            GPIO.add_event_detect(self.int_pin, GPIO.RISING, callback=self.callback)
+            # INT1 only rises again once the FIFO drops below the watermark
+            self.callback(self.int_pin)
+        elif not (self._thread and self._thread.is_alive()):
+            self._thread = threading.Thread(target=self._poll, name="AccelerometerInputDevice", daemon=True)
+            self._thread.start()
+
+    def disable(self) -> None:
+        super().disable()
+
+        self._stop.set()
+        if not self._running:
+            return  # the sensor never came up, nothing to undo
+
+        self._running = False
+        if self.int_pin is not None:
+            GPIO.remove_event_detect(self.int_pin)
+            GPIO.cleanup(self.int_pin)
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self.smbus is not None:
+            try:
+                self.smbus.write_byte_data(self.address, POWER_CTL, 0)
+            except OSError as e:
+                logger.warning(f"AccelerometerInputDevice standby failed: {e}")
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "vibration_threshold":
+            self.threshold = event.new_value / 1000
+        elif event.key == "vibration_trigger_enable":
+            if event.new_value:
+                self.enable()
+            else:
+                self.disable()
+
+    def setup_sensor(self, bus: Any) -> None:
+        devid = bus.read_byte_data(self.address, DEVID)
+        if devid != ADXL345_DEVID:
+            raise RuntimeError(f"Unexpected accelerometer id {devid:#x} at {self.address:#x}")
+
+        bus.write_byte_data(self.address, POWER_CTL, 0)
+        bus.write_byte_data(self.address, BW_RATE, RATE_CODES.get(self.rate, RATE_CODES[800]))
+        bus.write_byte_data(self.address, DATA_FORMAT, FULL_RES | RANGE_CODES.get(self.g_range, RANGE_CODES[16]))
+        bus.write_byte_data(self.address, FIFO_CTL, FIFO_STREAM | self.watermark)
+        bus.write_byte_data(self.address, INT_MAP, 0)  # everything to INT1
+        bus.write_byte_data(self.address, INT_ENABLE, WATERMARK)
+        bus.write_byte_data(self.address, POWER_CTL, MEASURE)
+        bus.read_byte_data(self.address, INT_SOURCE)
+
+    def read_fifo(self, max_rounds: int = 4) -> bytes:
+        """Drains the queued FIFO entries.
+
+        The ADXL345 pops one entry per multi-byte read of DATAX0..DATAZ1, so every
+        entry is a single 6-byte block read and nothing is read twice. Samples keep coming
+        during the reads, so FIFO_STATUS is read again until it is below the watermark:
+        INT1 only rises again from there. `max_rounds` bounds the loop when the bus
+        cannot keep up with the output rate.
+        """
+
+        bus = self.smbus
+        raw = bytearray()
+        if bus is None:
+            return bytes(raw)
+
+        for _ in range(max_rounds):
+            entries = bus.read_byte_data(self.address, FIFO_STATUS) & 0x3F
+            for _ in range(entries):
+                raw += bytes(bus.read_i2c_block_data(self.address, DATAX0, ENTRY_SIZE))
+            if entries < self.watermark:
+                break
+        return bytes(raw)
+
+    def callback(self, channel: int) -> None:
+        if self._stop.is_set():
+            return
+
+        with self._lock:
+            try:
+                raw = self.read_fifo()
+            except OSError as e:
+                logger.warning(f"AccelerometerInputDevice FIFO read failed: {e}")
+                return
+
+        if raw:
+            self.process(raw, time.monotonic())
+
+    def _poll(self) -> None:
+        interval = self.watermark / self.rate
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+            self.callback(-1)
+
+    def process(self, raw: bytes, timestamp: float) -> float:
+        """Evaluates one FIFO batch, returns its peak deviation from the baseline in g."""
+
+        samples = decode_fifo(raw)
+        magnitude = np.sqrt(np.einsum("ij,ij->i", samples, samples))
+        deviation = float(np.abs(magnitude - self.baseline).max())
+        self.samples_read += len(samples)
+        self.last_batch_peak = deviation
+
+        if not self._active and deviation >= self.threshold:
+            self._set_active(True, timestamp)
+        elif self._active and deviation < self.threshold * self.release_ratio:
+            self._set_active(False, timestamp)
+
+        if not self._active:
+            # only quiet batches feed the baseline, so a long shake does not become the new normal
+            self.baseline += 0.1 * (float(magnitude.mean()) - self.baseline)
+
+        return deviation
+
+    def _set_active(self, active: bool, timestamp: float) -> None:
+        logger.debug(f"AccelerometerInputDevice {'shutter' if active else 'release'}: {self.last_batch_peak:.3f}g")
+        self._active = active
+        self._last_value = int(active)
+        if active:
+            self.last_trigger = timestamp
+
+        if self.notify_callback is not None:
+            asyncio.run_coroutine_threadsafe(self.notify_callback(active), self.loop)
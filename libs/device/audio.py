@@ -0,0 +1,254 @@
+import asyncio
+import io
+import logging
+import subprocess
+import threading
+import time
+import wave
+
+from dataclasses import dataclass
+from typing import Optional, cast
+
+import numpy as np
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+FULL_SCALE = 32768.0  # S16_LE
+
+
+@dataclass(frozen=True)
+class AudioBlock:
+    timestamp: float  # monotonic time of the first frame in the block, seconds
+    frames: int
+    rms: float  # 0..1 of full scale
+    peak: float  # 0..1 of full scale
+
+
+def block_level(samples: np.ndarray) -> tuple[float, float]:
+    """Returns (rms, peak) of an int16 block, both relative to full scale."""
+
+    if not len(samples):
+        return 0.0, 0.0
+
+    x: np.ndarray = samples.astype(np.float32)
+    rms = float(np.sqrt(np.dot(x, x) / len(x))) / FULL_SCALE
+    peak = float(max(x.max(), -x.min())) / FULL_SCALE
+    return rms, peak
+
+
+class AudioSource:
+    sample_rate: int = 44100
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        """Returns up to `frames` mono int16 samples, None when the stream is over."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class WaveAudioSource(AudioSource):
+    """Reads 16-bit PCM from a WAV file, only the first channel is used.
+
+    With `realtime=False` blocks are returned as fast as they can be read,
+    which is what offline tests and benchmarks want.
+    """
+
+    def __init__(self, path: str, realtime: bool = False) -> None:
+        self.path = path
+        self.realtime = realtime
+        self._wave = wave.open(path, "rb")  # noqa: SIM115
+        if self._wave.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+
+        self.sample_rate = self._wave.getframerate()
+        self.channels = self._wave.getnchannels()
+        self._started_at: Optional[float] = None
+        self._frames_read = 0
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        data = self._wave.readframes(frames)
+        if not data:
+            return None
+
+        samples: np.ndarray = np.frombuffer(data, dtype="<i2")
+        if self.channels > 1:
+            samples = samples[:: self.channels]
+
+        if self.realtime:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            self._frames_read += len(samples)
+            delay = self._started_at + self._frames_read / self.sample_rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return samples
+
+    def close(self) -> None:
+        self._wave.close()
+
+
+class AlsaAudioSource(AudioSource):
+    """Captures mono S16_LE from an ALSA device through `arecord`."""
+
+    def __init__(self, device: str = "default", sample_rate: int = 44100) -> None:
+        self.device = device
+        self.sample_rate = sample_rate
+        self._process = subprocess.Popen(  # noqa: S603
+            ["arecord", "-q", "-D", device, "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(sample_rate)],  # noqa: S607
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        if self._process.stdout is None:
+            return None
+
+        stdout = cast(io.RawIOBase, self._process.stdout)  # unbuffered, a FileIO
+        buffer = bytearray(frames * 2)
+        view = memoryview(buffer)
+        received = 0
+        while received < len(buffer):
+            n = stdout.readinto(view[received:])
+            if not n:
+                break
+            received += n
+
+        if not received:
+            return None
+
+        samples: np.ndarray = np.frombuffer(buffer, dtype="<i2", count=received // 2)
+        return samples
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.wait()
+
+
+class AudioInputDevice(InputDevice):
+    """Sound trigger: shutter when the block level rises above the threshold, release when it falls back.
+
+    The threshold is compared against the block peak (`metric="peak"`) or RMS (`metric="rms"`),
+    release happens once the level drops below `threshold * release_ratio`.
+    Smaller blocks react faster, larger blocks cost less CPU per second of audio.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        source: Optional[AudioSource] = None,
+        device: str = "default",
+        sample_rate: int = 44100,
+        metric: str = "peak",
+        release_ratio: float = 0.5,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.source = source
+        self.device = device
+        self.sample_rate = sample_rate
+        self.metric = metric
+        self.release_ratio = release_ratio
+
+        self.threshold = self.config.audio_trigger_threshold.value / 100
+        self.block_size = self.config.audio_block_size.value
+        self.last_block: Optional[AudioBlock] = None
+        self.last_trigger: Optional[AudioBlock] = None
+        self._active = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.audio_trigger_enable.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, name="AudioInputDevice", daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        super().disable()
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "audio_trigger_threshold":
+            self.threshold = event.new_value / 100
+        elif event.key == "audio_block_size":
+            self.block_size = event.new_value
+        elif event.key == "audio_trigger_enable":
+            if event.new_value:
+                self.enable()
+            else:
+                self.disable()
+
+    def _worker(self) -> None:
+        try:
+            source = self.source or AlsaAudioSource(self.device, self.sample_rate)
+        except Exception as e:
+            logger.exception(e)
+            return
+
+        try:
+            self.run(source)
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            source.close()
+
+    def run(self, source: AudioSource) -> int:
+        """Processes `source` block by block until it ends or the device is disabled, returns blocks processed."""
+
+        started_at = time.monotonic()
+        frames_total = 0
+        blocks = 0
+        while not self._stop.is_set():
+            samples = source.read(max(self.block_size, 1))
+            if samples is None:
+                break
+
+            self.process(samples, started_at + frames_total / source.sample_rate)
+            frames_total += len(samples)
+            blocks += 1
+
+        return blocks
+
+    def process(self, samples: np.ndarray, timestamp: float) -> AudioBlock:
+        rms, peak = block_level(samples)
+        block = AudioBlock(timestamp=timestamp, frames=len(samples), rms=rms, peak=peak)
+        self.last_block = block
+
+        level = peak if self.metric == "peak" else rms
+        if not self._active and level >= self.threshold:
+            self._set_active(True, block)
+        elif self._active and level < self.threshold * self.release_ratio:
+            self._set_active(False, block)
+
+        return block
+
+    def _set_active(self, active: bool, block: AudioBlock) -> None:
+        logger.debug(f"AudioInputDevice {'shutter' if active else 'release'} at {block}")
+        self._active = active
+        self._last_value = int(active)
+        if active:
+            self.last_trigger = block
+
+        if self.notify_callback is not None:
+            asyncio.run_coroutine_threadsafe(self.notify_callback(active), self.loop)
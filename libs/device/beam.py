@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import RPi.GPIO as GPIO
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+
+def polarity(inverted: bool) -> float:
+    """Sign of the contrast, receivers that pull the input low when lit are `inverted`."""
+
+    return -1.0 if inverted else 1.0
+
+
+def demodulate(samples: np.ndarray, emitter: np.ndarray, window: int, inverted: bool = False) -> np.ndarray:
+    """Lock-in demodulation of recorded samples.
+
+    `samples` and `emitter` hold one entry per half carrier period: the input level and
+    whether the emitter was lit while it was taken, starting with a lit half. Returns the
+    beam contrast for every carrier period, averaged over the last `window` periods:
+    ~1 when the receiver follows the emitter, ~0 when the beam is broken. Anything that does
+    not follow the carrier (ambient light, flicker) cancels between the lit and dark halves.
+    """
+
+    periods = min(len(samples), len(emitter)) // 2
+    reference = np.where(emitter[: periods * 2], 1.0, -1.0) * polarity(inverted)
+    products = np.asarray(samples[: periods * 2], dtype=np.float64) * reference
+    per_period = products[0::2] + products[1::2]
+
+    sums = np.cumsum(per_period)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, periods + 1), window)
+    contrast: np.ndarray = sums / counts
+    return contrast
+
+
+class LockInDetector:
+    """Online version of `demodulate`, fed one carrier period at a time.
+
+    The beam is reported broken when the contrast over the last `window` periods drops
+    below `threshold`, so a break is detected at most `ceil(window * (1 - threshold)) + 1`
+    periods after it happens.
+    """
+
+    def __init__(self, window: int = 8, threshold: float = 0.5, inverted: bool = False) -> None:
+        self.window = window
+        self.threshold = threshold
+        self.inverted = inverted
+        self._sign = polarity(inverted)
+        self._periods: deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+
+    def reset(self) -> None:
+        self._periods.clear()
+        self._sum = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return len(self._periods) == self.window
+
+    @property
+    def contrast(self) -> float:
+        return self._sum / len(self._periods) if self._periods else 0.0
+
+    def update(self, lit: float, dark: float) -> bool:
+        """Feeds the input levels sampled in the lit and dark halves, returns True while the beam is intact."""
+
+        value = (lit - dark) * self._sign
+        if len(self._periods) == self.window:
+            self._sum -= self._periods[0]
+        self._periods.append(value)
+        self._sum += value
+        return self.contrast >= self.threshold
+
+
+class BeamBreakInputDevice(InputDevice):
+    """Modulated IR beam: shutter when the beam is broken, release when it is restored.
+
+    A dedicated thread toggles the emitter at `frequency` Hz and samples the trigger input
+    at the end of every half period, i.e. in phase with the emitter, feeding a `LockInDetector`.
+    Receivers that pull the input low when lit need `inverted=True`.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        emitter_pin: int,
+        input_pin: int,
+        frequency: int = 500,
+        window: int = 8,
+        threshold: float = 0.5,
+        inverted: bool = True,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.emitter_pin = emitter_pin
+        self.input_pin = input_pin
+        self.frequency = frequency
+        self.detector = LockInDetector(window=window, threshold=threshold, inverted=inverted)
+
+        self.periods = 0
+        self.late_periods = 0
+        self.last_break: Optional[float] = None
+        self._broken = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.digital_trigger_enable.value and self.config.digital_emmitter_enable.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        GPIO.setup(self.emitter_pin, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(self.input_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        self.detector.reset()
+        self._broken = False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="BeamBreakInputDevice", daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        super().disable()
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+            GPIO.output(self.emitter_pin, GPIO.LOW)
+            GPIO.cleanup(self.emitter_pin)
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key not in ("digital_trigger_enable", "digital_emmitter_enable"):
+            return
+
+        if self.enabled:
+            self.enable()
+        else:
+            self.disable()
+
+    def _run(self) -> None:
+        half = 0.5 / self.frequency
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            levels = []
+            for lit in (GPIO.HIGH, GPIO.LOW):
+                GPIO.output(self.emitter_pin, lit)
+                deadline += half
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                levels.append(GPIO.input(self.input_pin))
+
+            if time.monotonic() - deadline > half:
+                # lost the phase (e.g. the thread was not scheduled), start the grid over
+                self.late_periods += 1
+                deadline = time.monotonic()
+
+            self.process(levels[0], levels[1], time.monotonic())
+
+    def process(self, lit: float, dark: float, timestamp: float) -> bool:
+        """Feeds one carrier period, returns True while the beam is broken."""
+
+        self.periods += 1
+        broken = not self.detector.update(lit, dark)
+        if not self.detector.ready:
+            return self._broken
+
+        if broken != self._broken:
+            logger.debug(
+                f"BeamBreakInputDevice {'shutter' if broken else 'release'}, contrast {self.detector.contrast}"
+            )
+            self._broken = broken
+            self._last_value = int(broken)
+            if broken:
+                self.last_break = timestamp
+
+            if self.notify_callback is not None:
+                asyncio.run_coroutine_threadsafe(self.notify_callback(broken), self.loop)
+
+        return broken
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+
+from collections import deque
+from typing import Optional
+
+from libs.device.input import InputDevice
+from libs.device.output import BluetoothOuputDevice, OutputDevice
+from libs.utils import summarize
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+
+class CameraInputDevice(InputDevice):
+    """The camera's own shutter button as a trigger, seen through the `S_ACTIVE`/`S_READY` notifications
+    of the Bluetooth remote.
+
+    Shots fired by the Bluetooth output are not reported back, so the camera does not retrigger itself.
+    The delay from the notification to the last of `outputs` firing is kept in `latencies`.
+    """
+
+    def __init__(self, config: Config, camera: BluetoothOuputDevice, outputs: list[OutputDevice]):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.camera = camera
+        self.outputs = [o_device for o_device in outputs if o_device is not camera]
+        self.last_latency: Optional[float] = None
+        self.latencies: deque[float] = deque(maxlen=100)
+        self._tasks: set[asyncio.Task[None]] = set()  # deliveries in flight, the loop only keeps weak references
+        camera.shutter_listener = self.on_shutter
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.camera_trigger_enable.value
+
+    @property
+    def latency_summary(self) -> dict[str, float]:
+        return summarize(self.latencies)
+
+    def on_shutter(self, pressed: bool, notified_at: float) -> None:
+        if self.notify_callback is None or not self.enabled:
+            return
+
+        self._last_value = int(pressed)
+        task = self.loop.create_task(self.deliver(pressed, notified_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def deliver(self, pressed: bool, notified_at: float) -> None:
+        callback = self.notify_callback
+        if callback is None:
+            return
+
+        self.tracer.start_trace(notified_at)
+        with self.tracer.span("CameraInputDevice.deliver", pressed=pressed):
+            await callback(pressed)
+        if pressed:
+            self.measure(notified_at)
+
+    def measure(self, notified_at: float) -> None:
+        # outputs deferred by admission control fire later and are not counted
+        fired = [at for at in (o_device.fired_at for o_device in self.outputs) if at is not None and at >= notified_at]
+        if not fired:
+            return
+
+        self.last_latency = max(fired) - notified_at
+        self.latencies.append(self.last_latency)
+        logger.info(
+            f"CameraInputDevice notification to outputs {(min(fired) - notified_at) * 1000:.3f}"
+            f" - {self.last_latency * 1000:.3f} ms, {(time.monotonic() - notified_at) * 1000:.3f} ms to done"
+        )
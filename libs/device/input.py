@@ -8,6 +8,7 @@ import RPi.GPIO as GPIO
 
 from libs.eventbus import EventBusDefaultDict
 from libs.eventtypes import ConfigChangeEvent
+from libs.trace import Tracer
 from menu.data import Config
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,7 @@ class InputDevice:
 
     def __init__(self, config: Config):
         self.config = config
+        self.tracer = Tracer()
         self.bus = EventBusDefaultDict()
         self.bus.add_listener(ConfigChangeEvent, self.on_config_change)
         logger.info(f"Created input device {self.__class__.__name__}")
@@ -50,18 +52,21 @@ class GPIODevice(InputDevice):
 
         self.loop = asyncio.get_event_loop()
         self.pin = pin
+        self.detecting = False
 
     def enable(self) -> None:
         super().enable()
 
         GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         GPIO.add_event_detect(self.pin, GPIO.BOTH, callback=self.callback)  # , bouncetime=self.bouncetime)
+        self.detecting = True
 
     def disable(self) -> None:
         super().disable()
 
         GPIO.remove_event_detect(self.pin)
         GPIO.cleanup(self.pin)
+        self.detecting = False
 
     def callback(self, channel: int) -> None:
         logger.debug(f"GPIODevice.callback on {channel}")
@@ -84,25 +89,42 @@ class DigitalInputDevice(GPIODevice):
 
     @property
     def enabled(self) -> bool:
-        return self.config.digital_trigger_enable.value  # type: ignore
+        # with the emitter on, the input carries the modulated beam and BeamBreakInputDevice samples it
+        return self.config.digital_trigger_enable.value and not self.config.digital_emmitter_enable.value  # type: ignore
 
     @property
     def bouncetime(self) -> int:
         return self.config.trigger_read_timer.value  # type: ignore
 
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key not in ("digital_trigger_enable", "digital_emmitter_enable"):
+            return
+
+        if self.enabled and not self.detecting:
+            self.enable()
+        elif not self.enabled and self.detecting:
+            # keep the pin set up, BeamBreakInputDevice may be sampling it already
+            GPIO.remove_event_detect(self.pin)
+            self.detecting = False
+
     def callback(self, channel: int) -> None:
         if not self.enabled and self.notify_callback is None:
             return
 
-        value = GPIO.input(self.pin)
-        if value != self._last_value and self.notify_callback is not None:
-            logger.debug(f"DigitalInputDevice.callback on {channel}: {self._last_value} -> {value}, mode {self.mode}")
-            self._last_value = value
-
-            return_value: bool = (
-                self._last_value == 1 if self.mode == IDeviceTriggerMode.ABOVE_THRESHOLD else self._last_value == 0
-            )
-            asyncio.run_coroutine_threadsafe(self.notify_callback(return_value), self.loop)
+        # the trace id set here follows the edge through run_coroutine_threadsafe into Router and the outputs
+        self.tracer.start_trace()
+        with self.tracer.span("DigitalInputDevice.callback", pin=channel):
+            value = GPIO.input(self.pin)
+            if value != self._last_value and self.notify_callback is not None:
+                logger.debug(
+                    f"DigitalInputDevice.callback on {channel}: {self._last_value} -> {value}, mode {self.mode}"
+                )
+                self._last_value = value
+
+                return_value: bool = (
+                    self._last_value == 1 if self.mode == IDeviceTriggerMode.ABOVE_THRESHOLD else self._last_value == 0
+                )
+                asyncio.run_coroutine_threadsafe(self.notify_callback(return_value), self.loop)
 
 
 # class AnalogInputDevice(InputDevice):
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import math
+import time
+
+from typing import Optional
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from libs.utils import sleep_until
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+
+class IntervalometerInputDevice(InputDevice):
+    """Timelapse: a shutter and a release edge every `intervalometer_interval` ms, routed like any trigger.
+
+    Shot n is due at `start + n * interval`, computed from the start and never accumulated, so the time
+    a shot takes does not add up over the session. A shot still running when later slots come due makes
+    those slots missed: they are counted and logged, the session carries on at the next free slot.
+    After `intervalometer_frames` shots (0 runs until disabled) the device switches itself off.
+    """
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.shots = 0
+        self.missed = 0
+        self.last_lateness: Optional[float] = None  # s the last shot started after its slot
+        self.max_lateness = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.intervalometer_enable.value
+
+    @property
+    def interval(self) -> float:
+        return self.config.intervalometer_interval.value / 1000
+
+    @property
+    def frames(self) -> int:
+        return self.config.intervalometer_frames.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self.run(self.interval, self.frames))
+
+    def disable(self) -> None:
+        super().disable()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key not in ("intervalometer_enable", "intervalometer_interval", "intervalometer_frames"):
+            return
+
+        # a new interval or frame count starts a new session
+        self.disable()
+        if self.enabled:
+            self.enable()
+
+    async def run(self, interval: float, frames: int) -> None:
+        if interval <= 0:
+            logger.error(f"IntervalometerInputDevice interval {interval * 1000:.0f} ms is not positive")
+            return
+
+        logger.info(f"IntervalometerInputDevice every {interval * 1000:.0f} ms, {frames or 'unlimited'} frames")
+        self.shots = self.missed = 0
+        self.max_lateness = 0.0
+        start = time.monotonic()
+        slot = 0
+        while not frames or self.shots < frames:
+            due = start + slot * interval
+            await sleep_until(due)
+
+            self.last_lateness = time.monotonic() - due
+            self.max_lateness = max(self.max_lateness, self.last_lateness)
+            self.shots += 1
+            await self.shoot()
+
+            next_slot = max(slot + 1, math.ceil((time.monotonic() - start) / interval))
+            if next_slot > slot + 1:
+                self.missed += next_slot - slot - 1
+                logger.warning(
+                    f"IntervalometerInputDevice shot {self.shots} overran, {next_slot - slot - 1} slots missed"
+                    f" ({self.missed} in total)"
+                )
+            slot = next_slot
+
+        logger.info(
+            f"IntervalometerInputDevice done: {self.shots} shots, {self.missed} missed slots,"
+            f" max lateness {self.max_lateness * 1000:.3f} ms"
+        )
+        self._task = None
+        self.config.intervalometer_enable.value = False
+
+    async def shoot(self) -> None:
+        if self.notify_callback is None:
+            return
+
+        self.tracer.start_trace()
+        self._last_value = 1
+        await self.notify_callback(True)
+        self._last_value = 0
+        await self.notify_callback(False)
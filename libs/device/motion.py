@@ -0,0 +1,305 @@
+import asyncio
+import io
+import logging
+import subprocess
+import threading
+import time
+
+from pathlib import Path
+from typing import Optional, cast
+
+import numpy as np
+
+from PIL import Image
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+ROI = tuple[float, float, float, float]  # x0, y0, x1, y1 as fractions of the frame
+FULL_FRAME: ROI = (0.0, 0.0, 1.0, 1.0)
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp", ".pgm")
+
+
+def downscale(frame: np.ndarray, factor: int) -> np.ndarray:
+    """Block-averages a grayscale frame by an integer factor."""
+
+    if factor <= 1:
+        return frame
+
+    h, w = frame.shape[0] // factor * factor, frame.shape[1] // factor * factor
+    blocks = frame[:h, :w].reshape(h // factor, factor, w // factor, factor)
+    scaled: np.ndarray = blocks.mean(axis=(1, 3), dtype=np.float32)
+    return scaled
+
+
+def roi_slice(start: float, end: float, size: int) -> slice:
+    first = min(int(start * size), size - 1)
+    return slice(first, max(int(end * size), first + 1))
+
+
+class FrameSource:
+    def read(self) -> Optional[np.ndarray]:
+        """Returns the next grayscale frame as a 2D array, None when the stream is over."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class FfmpegFrameSource(FrameSource):
+    """Grayscale frames from a V4L2 device (Pi camera included) or a video file, scaled by ffmpeg."""
+
+    def __init__(self, path: str = "/dev/video0", width: int = 160, height: int = 120, fps: int = 15) -> None:
+        self.path = path
+        self.width = width
+        self.height = height
+        args = ["ffmpeg", "-loglevel", "error"]
+        if path.startswith("/dev/video"):
+            args += ["-f", "v4l2", "-framerate", str(fps)]
+        args += ["-i", path, "-vf", f"scale={width}:{height}", "-pix_fmt", "gray", "-f", "rawvideo", "-"]
+        self._process = subprocess.Popen(args, stdout=subprocess.PIPE, bufsize=0)  # noqa: S603
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._process.stdout is None:
+            return None
+
+        stdout = cast(io.RawIOBase, self._process.stdout)  # unbuffered, a FileIO
+        buffer = bytearray(self.width * self.height)
+        view = memoryview(buffer)
+        received = 0
+        while received < len(buffer):
+            n = stdout.readinto(view[received:])
+            if not n:
+                return None
+            received += n
+
+        frame: np.ndarray = np.frombuffer(buffer, dtype=np.uint8).reshape(self.height, self.width)
+        return frame
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.wait()
+
+
+class DirectoryFrameSource(FrameSource):
+    """Reads image files from a directory in name order, for headless runs and benchmarks."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._files = sorted(p for p in Path(path).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        self._index = 0
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._index >= len(self._files):
+            return None
+
+        with Image.open(self._files[self._index]) as image:
+            frame: np.ndarray = np.asarray(image.convert("L"))
+        self._index += 1
+        return frame
+
+
+class MotionDetector:
+    """Running-average background subtraction with per-ROI thresholds.
+
+    A pixel is changed when it differs from the background by more than `pixel_threshold`,
+    a ROI reports motion when the changed fraction of its pixels reaches `area_threshold`.
+    """
+
+    def __init__(
+        self,
+        rois: Optional[list[ROI]] = None,
+        pixel_threshold: int = 25,
+        area_threshold: float = 0.02,
+        alpha: float = 0.05,
+        width: int = 160,
+    ) -> None:
+        self.rois = rois or [FULL_FRAME]
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.alpha = alpha
+        self.width = width
+        self.background: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._slices: list[tuple[slice, slice]] = []
+
+    def reset(self) -> None:
+        self.background = None
+
+    def _prepare(self, frame: np.ndarray) -> None:
+        h, w = frame.shape
+        self.background = frame.astype(np.float32)
+        self._diff = np.empty((h, w), dtype=np.float32)
+        self._slices = [(roi_slice(y0, y1, h), roi_slice(x0, x1, w)) for x0, y0, x1, y1 in self.rois]
+
+    def update(self, frame: np.ndarray) -> list[float]:
+        """Feeds a frame and returns the changed fraction for each ROI."""
+
+        frame = downscale(frame, frame.shape[1] // self.width)
+        if self.background is None or self._diff is None or self.background.shape != frame.shape:
+            self._prepare(frame)
+            return [0.0] * len(self.rois)
+
+        diff = self._diff
+        np.subtract(frame, self.background, out=diff)
+        # background follows the scene slowly, so lighting drift does not accumulate into motion
+        self.background += self.alpha * diff
+        np.abs(diff, out=diff)
+        changed: np.ndarray = diff > self.pixel_threshold
+
+        return [float(changed[rows, cols].mean()) for rows, cols in self._slices]
+
+    def detect(self, frame: np.ndarray) -> bool:
+        return any(fraction >= self.area_threshold for fraction in self.update(frame))
+
+
+class MotionInputDevice(InputDevice):
+    """Motion trigger: shutter when any ROI sees motion, release when the scene settles.
+
+    Frames are captured on one thread and analysed on another; when analysis falls behind,
+    only the newest frame is kept and the rest are counted in `dropped_frames`.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        source: Optional[FrameSource] = None,
+        path: str = "/dev/video0",
+        rois: Optional[list[ROI]] = None,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.source = source
+        self.path = path
+        self.detector = MotionDetector(
+            rois=rois,
+            pixel_threshold=self.config.motion_threshold.value,
+            area_threshold=self.config.motion_area.value / 100,
+        )
+
+        self.processed_frames = 0
+        self.dropped_frames = 0
+        self.last_detection: Optional[float] = None
+        self._active = False
+        self._frame: Optional[np.ndarray] = None
+        self._frame_ready = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.motion_trigger_enable.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if any(thread.is_alive() for thread in self._threads):
+            return
+
+        self._stop.clear()
+        self.detector.reset()
+        self._threads = [
+            threading.Thread(target=self._capture, name="MotionInputDevice.capture", daemon=True),
+            threading.Thread(target=self._analyse, name="MotionInputDevice.analyse", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def disable(self) -> None:
+        super().disable()
+
+        self._stop.set()
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "motion_threshold":
+            self.detector.pixel_threshold = event.new_value
+        elif event.key == "motion_area":
+            self.detector.area_threshold = event.new_value / 100
+        elif event.key == "motion_trigger_enable":
+            if event.new_value:
+                self.enable()
+            else:
+                self.disable()
+
+    def _capture(self) -> None:
+        try:
+            source = self.source or FfmpegFrameSource(self.path)
+        except Exception as e:
+            logger.exception(e)
+            self._stop.set()
+            return
+
+        try:
+            while not self._stop.is_set():
+                frame = source.read()
+                if frame is None:
+                    break
+
+                with self._frame_ready:
+                    if self._frame is not None:
+                        self.dropped_frames += 1
+                    self._frame = frame
+                    self._frame_ready.notify()
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            source.close()
+            self._stop.set()
+            with self._frame_ready:
+                self._frame_ready.notify_all()
+
+    def _analyse(self) -> None:
+        while True:
+            with self._frame_ready:
+                while self._frame is None and not self._stop.is_set():
+                    self._frame_ready.wait()
+                frame, self._frame = self._frame, None
+
+            if frame is None:
+                break
+
+            try:
+                self.process(frame, time.monotonic())
+            except Exception as e:
+                logger.exception(e)
+
+    def run(self, source: FrameSource) -> int:
+        """Analyses every frame of `source` on the calling thread, returns frames processed."""
+
+        frames = 0
+        while not self._stop.is_set():
+            frame = source.read()
+            if frame is None:
+                break
+
+            self.process(frame, time.monotonic())
+            frames += 1
+
+        return frames
+
+    def process(self, frame: np.ndarray, timestamp: float) -> bool:
+        motion = self.detector.detect(frame)
+        self.processed_frames += 1
+
+        if motion != self._active:
+            logger.debug(f"MotionInputDevice {'shutter' if motion else 'release'} at {timestamp:.3f}")
+            self._active = motion
+            self._last_value = int(motion)
+            if motion:
+                self.last_detection = timestamp
+
+            if self.notify_callback is not None:
+                asyncio.run_coroutine_threadsafe(self.notify_callback(motion), self.loop)
+
+        return motion
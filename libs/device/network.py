@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import os
+import socket
+import struct
+import time
+
+from collections import OrderedDict, deque
+from typing import Any, Optional
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent, NetworkStatsEvent
+from libs.utils import summarize
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RSR1"
+PACKET = struct.Struct("!4sBIIQ")  # magic, command, session, sequence, sender time.time_ns()
+RELEASE = 0
+SHUTTER = 1
+SEQUENCE_MOD = 1 << 32
+
+
+def pack_trigger(command: int, session: int, sequence: int, sent_ns: Optional[int] = None) -> bytes:
+    return PACKET.pack(MAGIC, command, session, sequence % SEQUENCE_MOD, time.time_ns() if sent_ns is None else sent_ns)
+
+
+class SequenceWindow:
+    """Sliding-window duplicate filter (as in IPsec anti-replay) for one sender session.
+
+    Sequence numbers are 32 bit and compared in serial number arithmetic (RFC 1982): a number up to
+    half the range ahead of the highest one is newer, so a sender may wrap around.
+    """
+
+    def __init__(self, size: int = 64) -> None:
+        self.size = size
+        self.highest = -1
+        self._mask = 0
+
+    def accept(self, sequence: int) -> bool:
+        shift = (sequence - self.highest) % SEQUENCE_MOD
+        if self.highest < 0 or 0 < shift < SEQUENCE_MOD // 2:
+            self._mask = ((self._mask << shift) | 1) & ((1 << self.size) - 1) if shift < self.size else 1
+            self.highest = sequence
+            return True
+
+        offset = (self.highest - sequence) % SEQUENCE_MOD
+        if offset >= self.size or self._mask & (1 << offset):
+            return False
+
+        self._mask |= 1 << offset
+        return True
+
+
+class LatencyStats:
+    """One-way latency of the last `size` packets, sender and receiver clocks are assumed in sync."""
+
+    def __init__(self, size: int = 1000) -> None:
+        self.latencies: deque[int] = deque(maxlen=size)  # ns
+        self.received = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.malformed = 0
+
+    def add(self, latency_ns: int) -> None:
+        self.latencies.append(latency_ns)
+
+    def summary(self) -> dict[str, float]:
+        return summarize(self.latencies, 1e-6)  # ns to ms
+
+
+class UdpTriggerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, device: "UdpInputDevice") -> None:
+        self.device = device
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.device.on_packet(data, addr, time.time_ns())
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"UdpInputDevice socket error: {exc}")
+
+
+class UdpInputDevice(InputDevice):
+    """Remote trigger over UDP.
+
+    Each packet carries a command (shutter/release), a random per-sender session id,
+    a sequence number and the sender's wall clock in ns. Repeated or stale sequence numbers
+    are dropped, so senders may send every command several times for reliability. The duplicate
+    filters of the last `sessions` senders are kept.
+    """
+
+    REBIND_DELAY = 1.0  # s the port has to stay unchanged before the socket is bound to it
+
+    def __init__(
+        self,
+        config: Config,
+        host: str = "0.0.0.0",  # noqa: S104
+        stats_interval: int = 5000,
+        sessions: int = 64,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.host = host
+        self.stats_interval = stats_interval
+        self.sessions = sessions
+        self.stats = LatencyStats()
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._windows: OrderedDict[tuple[str, int], SequenceWindow] = OrderedDict()  # least recently used first
+        self._stats_task: Optional[asyncio.Task[None]] = None
+        self._rebind_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.udp_trigger_enable.value
+
+    @property
+    def port(self) -> int:
+        return self.config.udp_port.value
+
+    async def start(self) -> None:
+        if self.transport is not None or not self.enabled:
+            return
+
+        try:
+            self.transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: UdpTriggerProtocol(self), local_addr=(self.host, self.port)
+            )
+        except (OSError, OverflowError) as e:
+            logger.error(f"UdpInputDevice cannot listen on {self.host}:{self.port}: {e}")
+            return
+
+        self._stats_task = asyncio.create_task(self.publish_stats())
+        logger.info(f"UdpInputDevice listening on {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        if self._stats_task is not None:
+            self._stats_task.cancel()
+            self._stats_task = None
+
+    def disable(self) -> None:
+        super().disable()
+        if self._rebind_task is not None:
+            self._rebind_task.cancel()
+            self._rebind_task = None
+        self.stop()
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key not in ("udp_trigger_enable", "udp_port"):
+            return
+
+        if self._rebind_task is not None:
+            self._rebind_task.cancel()
+            self._rebind_task = None
+        if event.key == "udp_port" and self.enabled:
+            # every menu step changes the port, bind once it has settled
+            self._rebind_task = asyncio.create_task(self.rebind())
+            return
+
+        self.stop()
+        await self.start()
+
+    async def rebind(self) -> None:
+        await asyncio.sleep(self.REBIND_DELAY)
+        self._rebind_task = None
+        self.stop()
+        await self.start()
+
+    def on_packet(self, data: bytes, addr: Any, received_ns: int) -> None:
+        self.stats.received += 1
+        if len(data) != PACKET.size:
+            self.stats.malformed += 1
+            return
+
+        magic, command, session, sequence, sent_ns = PACKET.unpack(data)
+        if magic != MAGIC or command not in (RELEASE, SHUTTER):
+            self.stats.malformed += 1
+            return
+
+        key = (addr[0], session)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = SequenceWindow()
+            if len(self._windows) > self.sessions:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+        if not window.accept(sequence):
+            self.stats.duplicates += 1
+            return
+
+        self.stats.accepted += 1
+        self.stats.add(received_ns - sent_ns)
+
+        value = command == SHUTTER
+        self._last_value = int(value)
+        if self.notify_callback is not None:
+            self.loop.create_task(self.notify_callback(value))
+
+    async def publish_stats(self) -> None:
+        published = -1
+        while True:
+            await asyncio.sleep(self.stats_interval / 1000)
+            if self.stats.received == published:
+                continue
+
+            published = self.stats.received
+            summary = self.stats.summary()
+            self.bus.emit(
+                NetworkStatsEvent(
+                    received=self.stats.received,
+                    accepted=self.stats.accepted,
+                    duplicates=self.stats.duplicates,
+                    malformed=self.stats.malformed,
+                    latency_p50=summary.get("p50", 0.0),
+                    latency_p99=summary.get("p99", 0.0),
+                    latency_max=summary.get("max", 0.0),
+                ),
+                no_log=True,
+            )
+
+
+class UdpTriggerSender:
+    """Sends trigger packets, used by remote scripts and the load generator."""
+
+    def __init__(self, host: str, port: int, repeat: int = 1) -> None:
+        self.address = (host, port)
+        self.repeat = repeat
+        self.session = int.from_bytes(os.urandom(4), "big")
+        self.sequence = 0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, command: int) -> None:
+        packet = pack_trigger(command, self.session, self.sequence)
+        self.sequence += 1
+        for _ in range(self.repeat):
+            self.socket.sendto(packet, self.address)
+
+    def blast(self, rate: int, count: int) -> float:
+        """Sends `count` alternating shutter/release packets at `rate` per second, returns the achieved rate."""
+
+        started_at = time.monotonic()
+        for i in range(count):
+            deadline = started_at + i / rate
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.send(SHUTTER if i % 2 == 0 else RELEASE)
+
+        elapsed = time.monotonic() - started_at
+        return count / elapsed if elapsed else float(count)
+
+    def close(self) -> None:
+        self.socket.close()
@@ -1,8 +1,13 @@
 import asyncio
+import json
 import logging
+import math
 import time
 
-from typing import Optional, Union
+from collections import deque
+from collections.abc import Callable, Coroutine
+from enum import Enum
+from typing import Any, Optional, Union
 
 import gphoto2 as gp
 import RPi.GPIO as GPIO
@@ -10,22 +15,64 @@ import RPi.GPIO as GPIO
 from bleak import BleakClient
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
 from luma.core.render import canvas as Canvas
+from PIL import ImageDraw
 
 from libs.ble.utils import F_ACQUIRED, F_LOST, S_ACTIVE, S_READY, SFD, SFU, SHD, SHU, get_sony_device
+from libs.ble.writer import CommandWriter
 from libs.eventbus import EventBusDefaultDict
 from libs.eventtypes import ConfigChangeEvent
 from libs.fontawesome import fa
+from libs.pulse import PulseEngine
+from libs.trace import Tracer, edge_at
+from libs.utils import sleep_until, summarize
 from menu.data import Config
-from menu.oled import FONTS
+from menu.oled import FONTS, display_region
 
 logger = logging.getLogger(__name__)
 
 
+class OutputPhase(Enum):
+    IDLE = 0
+    SHUTTER = 1  # waiting for the shutter moment and issuing the shutter action
+    ACTIVE = 2  # shutter done, waiting for release
+    RELEASE = 3  # release lag and release action
+
+
+class RetriggerPolicy(Enum):
+    """What an output does with a shutter edge that arrives while it is still busy."""
+
+    IGNORE = 0  # drop it
+    RESTART = 1  # cancel the running cycle and start over
+    QUEUE = 2  # run one more cycle once the current one is over, further edges are dropped
+    EXTEND = 3  # keep the exposure going, the next release edge starts the release lag over
+
+
 class OutputDevice:
+    enable_key: Optional[str] = None  # Config item switching the device on and off
+    retrigger: Optional[RetriggerPolicy] = None  # None follows the retrigger_policy config item
+    effect_source: Optional[str] = None  # how latency calibration sees the effect: "notify", "capture" or "loopback"
+
     def __init__(self, config: Config):
         self.config = config
-        self.can_release = True
+        self.tracer = Tracer()
+        self._idle = asyncio.Event()
+        self.phase = OutputPhase.IDLE
+        self._shutter_done = asyncio.Event()
+        self._shutter_done.set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._release_task: Optional[asyncio.Task[None]] = None
+        self._queued: Optional[asyncio.Task[None]] = None  # next cycle waiting for the current one to be over
+        self._unreleased = 0  # started cycles still waiting for their release edge
+        self.ignored = 0  # edges dropped by the retrigger policy
+        self.fired_at: Optional[float] = None  # monotonic time the last shutter action was issued
+        self.shutter_started_at: Optional[float] = None
+        self.edge_at: Optional[float] = None  # monotonic time of the trigger edge behind the last shutter
+        self.effect_at: Optional[float] = None  # monotonic time the camera/flash actually reacted
+        self.effect_seen = asyncio.Event()
+        self.shutter_done_at: Optional[float] = None
+        self.release_started_at: Optional[float] = None
         self.bus = EventBusDefaultDict()
         self.bus.add_listener(ConfigChangeEvent, self.on_config_change)
         logger.info(f"Created output device {self.__class__.__name__}")
@@ -40,14 +87,185 @@ class OutputDevice:
 
     @property
     def enabled(self) -> bool:
-        return False
+        if not self.enable_key:
+            return False
+        return bool(getattr(self.config, self.enable_key).value)
 
-    async def shutter(self) -> None:
-        pass
+    @property
+    def phase(self) -> OutputPhase:
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: OutputPhase) -> None:
+        self._phase = phase
+        if phase is OutputPhase.IDLE:
+            self._idle.set()
+        else:
+            self._idle.clear()
+
+    @property
+    def busy(self) -> bool:
+        return self.phase is not OutputPhase.IDLE or any(not task.done() for task in self._tasks)
+
+    @property
+    def retrigger_policy(self) -> RetriggerPolicy:
+        # only consulted when an edge arrives while busy, so the config storage stays off the common path
+        if self.retrigger is not None:
+            return self.retrigger
+        try:
+            return RetriggerPolicy(self.config.retrigger_policy.value)
+        except ValueError:
+            return RetriggerPolicy.IGNORE
+
+    async def trigger(self, value: bool, deadline: Optional[float] = None) -> None:
+        """Runs one trigger edge through the retrigger policy and waits for the phase it started."""
+
+        task = self.on_shutter_edge(deadline) if value else self.on_release_edge()
+        if task is None:
+            return
+
+        await asyncio.wait({task})
+        if not task.cancelled():
+            task.result()
+
+    def on_shutter_edge(self, deadline: Optional[float] = None) -> Optional[asyncio.Task[None]]:
+        if not self.busy:
+            return self._start_cycle(self.shutter(deadline))
+
+        policy = self.retrigger_policy
+        if policy is RetriggerPolicy.RESTART:
+            cancelled = self._cancel_tasks()
+            return self._start_cycle(self._shutter_after(cancelled, deadline), queued=True)
+
+        if policy is RetriggerPolicy.QUEUE and (self._queued is None or self._queued.done()):
+            return self._start_cycle(self._shutter_when_idle(deadline), queued=True)
+
+        if policy is RetriggerPolicy.EXTEND and self._release_task is not None and not self._release_task.done():
+            # the output is still engaged while the release is pending or in its lag, so keep it that way
+            self._release_task.cancel()
+            self._unreleased += 1
+            return None
+
+        self.ignored += 1
+        logger.debug(f"{self.__class__.__name__} busy in {self.phase.name}, {policy.name} drops the shutter edge")
+        return None
+
+    def on_release_edge(self) -> Optional[asyncio.Task[None]]:
+        if not self._unreleased:
+            # idle, already releasing, or the matching shutter edge was dropped
+            self.ignored += 1
+            return None
+
+        # release edges pair with cycles in order, the last one may belong to the queued cycle
+        self._unreleased -= 1
+        if self._unreleased == 0 and self._queued is not None and not self._queued.done():
+            self._release_task = self._start(self._release_after(self._queued))
+        else:
+            self._release_task = self._start(self.release())
+        return self._release_task
+
+    async def cancel(self) -> None:
+        """Cancels the running cycle and everything queued behind it."""
+
+        cancelled = self._cancel_tasks()
+        if cancelled:
+            await asyncio.wait(cancelled)
+
+    def _cancel_tasks(self) -> list[asyncio.Task[None]]:
+        cancelled = [task for task in self._tasks if not task.done() and task is not asyncio.current_task()]
+        for task in cancelled:
+            task.cancel()
+        self._unreleased = 0
+        return cancelled
+
+    def _start(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _start_cycle(self, coro: Coroutine[Any, Any, None], queued: bool = False) -> asyncio.Task[None]:
+        self._unreleased += 1
+        task = self._start(coro)
+        if queued:
+            self._queued = task
+        return task
+
+    async def _shutter_after(self, cancelled: list[asyncio.Task[None]], deadline: Optional[float]) -> None:
+        if cancelled:
+            await asyncio.wait(cancelled)
+        await self.shutter(deadline)
+
+    async def _shutter_when_idle(self, deadline: Optional[float]) -> None:
+        await self._idle.wait()
+        await self.shutter(deadline)
+
+    async def _release_after(self, shutter: asyncio.Task[None]) -> None:
+        await asyncio.wait({shutter})
+        if not shutter.cancelled():
+            await self.release()
+
+    async def shutter(self, deadline: Optional[float] = None) -> None:
+        started_at = self.shutter_started_at = time.monotonic()
+        self.edge_at = edge_at.get() or started_at
+        self.phase = OutputPhase.SHUTTER
+        self._shutter_done.clear()
+        try:
+            with self.tracer.span(f"{self.__class__.__name__}.shutter"):
+                await self.do_shutter(deadline)
+        finally:
+            # the output is engaged only if the shutter action went out, otherwise there is nothing to release
+            fired = self.fired_at is not None and self.fired_at >= started_at
+            self.phase = OutputPhase.ACTIVE if fired else OutputPhase.IDLE
+            self.shutter_done_at = time.monotonic()
+            self._shutter_done.set()
 
     async def release(self) -> None:
+        # release starts as soon as the shutter phase completes, no polling in between
+        await self._shutter_done.wait()
+        if self.phase is OutputPhase.IDLE:
+            return  # the shutter action never went out
+
+        self.phase = OutputPhase.RELEASE
+        self.release_started_at = time.monotonic()
+        try:
+            with self.tracer.span(f"{self.__class__.__name__}.release"):
+                await self.do_release()
+        except asyncio.CancelledError:
+            # the release action did not go out, the output is still engaged
+            self.phase = OutputPhase.ACTIVE
+            raise
+        finally:
+            if self.phase is OutputPhase.RELEASE:
+                self.phase = OutputPhase.IDLE
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        """The shutter action, implementations call `mark_fired` the moment it goes out.
+
+        A cycle without `mark_fired` counts as not fired: the output goes back to IDLE and its release
+        edge is dropped.
+        """
+
+    async def do_release(self) -> None:
         pass
 
+    async def wait_shutter_lag(self, deadline: Optional[float] = None) -> None:
+        """Waits for the shutter moment: an absolute monotonic deadline when given, `shutter_lag` otherwise."""
+
+        with self.tracer.span("wait_shutter_lag"):
+            if deadline is not None:
+                await sleep_until(deadline)
+            elif self.shutter_lag:
+                await asyncio.sleep(self.shutter_lag / 1000)
+
+    def mark_fired(self) -> float:
+        self.fired_at = time.monotonic()
+        return self.fired_at
+
+    def mark_effect(self, at: Optional[float] = None) -> None:
+        self.effect_at = time.monotonic() if at is None else at
+        self.effect_seen.set()
+
     def enable(self) -> None:
         pass
 
@@ -66,58 +284,38 @@ class ConsoleOutputDevice(OutputDevice):
     def enabled(self) -> bool:
         return True
 
-    async def shutter(self) -> None:
-        if not self.enabled:
-            return
-
-        self.can_release = False
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
         logger.info(f"-> ConsoleOutputDevice Shutter {self.shutter_lag}")
-        await asyncio.sleep(self.shutter_lag / 1000)
+        await self.wait_shutter_lag(deadline)
+        self.mark_fired()
         logger.info(f"<- ConsoleOutputDevice Shutter {self.shutter_lag}")
-        self.can_release = True
-
-    async def release(self) -> None:
-        if not self.enabled:
-            return
 
-        while not self.can_release:
-            await asyncio.sleep(0.01)
+    async def do_release(self) -> None:
         logger.info(f"-> ConsoleOutputDevice Release {self.release_lag}")
         await asyncio.sleep(self.release_lag / 1000)
         logger.info(f"<- ConsoleOutputDevice Release {self.release_lag}")
 
 
 class ScreenOutputDevice(OutputDevice):
+    enable_key = "oled_blink_enable"
+
     def __init__(self, config: Config, canvas: Canvas):
         super().__init__(config)
         self.draw = canvas
 
-    @property
-    def enabled(self) -> bool:
-        return self.config.oled_blink_enable.value  # type: ignore
-
-    async def shutter(self) -> None:
-        if not self.enabled:
-            return
-
-        self.can_release = False
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
         logger.info(f"-> ScreenOutputDevice Shutter {self.shutter_lag}")
         with self.draw as draw:
             text, font = fa("hourglass", 16)
             draw.text((0, 16), text, font=font, fill="white")
-        await asyncio.sleep(self.shutter_lag / 1000)
+        await self.wait_shutter_lag(deadline)
+        self.mark_fired()
         with self.draw as draw:
             text, font = fa("camera", 16)
             draw.text((16, 16), text, font=font, fill="white")
         logger.info(f"<- ScreenOutputDevice Shutter {self.shutter_lag}")
-        self.can_release = True
-
-    async def release(self) -> None:
-        if not self.enabled:
-            return
 
-        while not self.can_release:
-            await asyncio.sleep(0.01)
+    async def do_release(self) -> None:
         logger.info(f"-> ScreenOutputDevice Release {self.release_lag}")
         with self.draw as draw:
             draw.rectangle((0, 16, 16, 32), fill="black", outline="black")
@@ -130,87 +328,275 @@ class ScreenOutputDevice(OutputDevice):
 
 
 class ScreenCounterOutputDevice(OutputDevice):
+    """Time elapsed since the shutter on the OLED, until the release, e.g. for bulb exposures.
+
+    Only the columns under the digits of pages 2-3 (rows 16-31) are redrawn and pushed, at most
+    `oled_timer_fps` times a second. Frames are kept on a fixed grid from the shutter, a frame that
+    overruns its slot skips the slots it missed instead of queueing them.
+    """
+
+    enable_key = "led_timer_enable"
+
+    PAGES = (2, 4)  # rows 16-31
+
     def __init__(self, config: Config, canvas: Canvas):
         super().__init__(config)
         self.draw = canvas
         self.active = False
+        self.fps: int = self.config.oled_timer_fps.value
+        self.frames = 0  # frames pushed by the last count
+        self.skipped = 0  # frame slots missed by the last count
+        self._counter: Optional[asyncio.Task[None]] = None
+        self._text = ""
+        self._width = 0  # columns covered by the last text
 
-    @property
-    def enabled(self) -> bool:
-        return False  # type: ignore
-
-    async def shutter(self) -> None:
-        if not self.enabled:
-            return
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "oled_timer_fps":
+            self.fps = event.new_value
 
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        # the counter runs until release, so it must not hold up the shutter phase
+        if self._counter is not None:
+            self._counter.cancel()
         self.active = True
+        self.mark_fired()
+        self._counter = asyncio.create_task(self.count(self.fired_at))  # type: ignore
+
+    async def count(self, start: float) -> None:
         logger.info(f"-> ScreenCounterOutputDevice Shutter {self.shutter_lag}")
-        start = time.monotonic()
+        period = 1 / max(self.fps, 1)
+        self.frames = self.skipped = 0
+        self._text = ""
+        slot = 0
         while self.active:
-            with self.draw as draw:
-                draw.rectangle((0, 16, 128, 32), fill="black", outline="black")
-                draw.text((0, 16), f"{time.monotonic() - start}", font=FONTS[8], fill="white")
-            await asyncio.sleep(0.01)
-        logger.info(f"<- ScreenCounterOutputDevice Shutter {self.shutter_lag}")
-
-    async def release(self) -> None:
-        if not self.enabled:
+            self.show(time.monotonic() - start)
+            self.frames += 1
+
+            next_slot = max(slot + 1, math.ceil((time.monotonic() - start) / period))
+            self.skipped += next_slot - slot - 1
+            slot = next_slot
+            await asyncio.sleep(max(start + slot * period - time.monotonic(), 0))
+        logger.info(
+            f"<- ScreenCounterOutputDevice Shutter {self.shutter_lag}, {self.frames} frames, {self.skipped} skipped"
+        )
+
+    def show(self, elapsed: float) -> None:
+        text = f"{elapsed:.1f} s"
+        if text == self._text:
             return
 
+        draw = ImageDraw.Draw(self.draw.image)
+        width = math.ceil(draw.textlength(text, font=FONTS[8]))
+        columns = min(max(width, self._width), self.draw.image.width)
+        top, bottom = self.PAGES[0] * 8, self.PAGES[1] * 8
+        draw.rectangle((0, top, columns - 1, bottom - 1), fill="black")
+        draw.text((0, top), text, font=FONTS[8], fill="white")
+        display_region(self.draw.device, self.draw.image, 0, columns, *self.PAGES)
+        self._text = text
+        self._width = width
+
+    async def do_release(self) -> None:
         logger.info(f"-> ScreenCounterOutputDevice Release {self.release_lag}")
         await asyncio.sleep(self.release_lag / 1000)
         self.active = False
-        # with self.draw as draw:
-        #     draw.rectangle((0, 16, 64, 32), fill="black", outline="black")
         logger.info(f"<- ScreenCounterOutputDevice Release {self.release_lag}")
 
 
 class PinOutputDevice(OutputDevice):
+    enable_key = "led_blink_enable"
+    effect_source = "loopback"
+
     def __init__(self, config: Config, pin: int = 29, inverted: bool = False):
         super().__init__(config)
         self.pin = pin
         self.inverted = inverted
+        self.pulse_engine: Optional[PulseEngine] = None  # precise mode, edges are timed on a dedicated thread
+        self.shutter_error: Optional[float] = None  # s, achieved minus requested time of the last edges
+        self.release_error: Optional[float] = None
         if self.enabled:
             self.enable()
 
-    @property
-    def enabled(self) -> bool:
-        return self.config.led_blink_enable.value  # type: ignore
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "pin_precise_enable" and self.enabled:
+            self.update_pulse_engine()
+        if event.key != self.enable_key:
+            return
+
+        if event.new_value:
+            self.enable()
+        else:
+            self.disable()
 
     def enable(self) -> None:
         super().enable()
 
         GPIO.setup(self.pin, GPIO.OUT)
+        self.update_pulse_engine()
 
     def disable(self) -> None:
         super().disable()
 
+        if self.pulse_engine is not None:
+            self.pulse_engine.stop()
+            self.pulse_engine = None
         GPIO.cleanup(self.pin)
 
-    async def shutter(self) -> None:
-        if not self.enabled:
-            return
+    def update_pulse_engine(self) -> None:
+        if self.config.pin_precise_enable.value:
+            if self.pulse_engine is None:
+                self.pulse_engine = PulseEngine(name=f"PulseEngine-{self.pin}")
+        elif self.pulse_engine is not None:
+            self.pulse_engine.stop()
+            self.pulse_engine = None
 
-        self.can_release = False
-        logger.info(f"-> LedOutputDevice Shutter {self.shutter_lag}")
-        await asyncio.sleep(self.shutter_lag / 1000)
+    def turn_on(self) -> None:
         GPIO.output(self.pin, GPIO.LOW if self.inverted else GPIO.HIGH)  # rpi0 led is inverted
-        logger.info(f"<- LedOutputDevice Shutter {self.shutter_lag}")
-        self.can_release = True
 
-    async def release(self) -> None:
-        if not self.enabled:
-            return
+    def turn_off(self) -> None:
+        GPIO.output(self.pin, GPIO.HIGH if self.inverted else GPIO.LOW)  # rpi0 led is inverted
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        logger.info(f"-> LedOutputDevice Shutter {self.shutter_lag}")
+        if self.pulse_engine is not None:
+            if deadline is None:
+                deadline = time.monotonic() + self.shutter_lag / 1000
+            self.shutter_error = await self.pulse_engine.edge(deadline, self.turn_on)
+            self.fired_at = deadline + self.shutter_error
+        else:
+            await self.wait_shutter_lag(deadline)
+            self.turn_on()
+            self.mark_fired()
+        logger.info(f"<- LedOutputDevice Shutter {self.shutter_lag}")
 
-        while not self.can_release:
-            await asyncio.sleep(0.01)
+    async def do_release(self) -> None:
         logger.info(f"-> LedOutputDevice Release {self.release_lag}")
-        await asyncio.sleep(self.release_lag / 1000)
-        GPIO.output(self.pin, GPIO.HIGH if self.inverted else GPIO.LOW)  # rpi0 led is inverted
+        if self.pulse_engine is not None:
+            deadline = (self.release_started_at or time.monotonic()) + self.release_lag / 1000
+            self.release_error = await self.pulse_engine.edge(deadline, self.turn_off)
+            logger.info(
+                f"LedOutputDevice pulse error: on {(self.shutter_error or 0) * 1e6:+.0f} us,"
+                f" off {self.release_error * 1e6:+.0f} us"
+            )
+        else:
+            await asyncio.sleep(self.release_lag / 1000)
+            self.turn_off()
         logger.info(f"<- LedOutputDevice Release {self.release_lag}")
 
 
+class OptronOutputDevice(OutputDevice):
+    """Camera wired remote port through two optocouplers: focus (half-press) and shutter (full press).
+
+    With `optron_prefocus` the focus line is held for as long as the device is enabled, so the camera
+    stays focused and the shutter line fires without autofocus delay. Otherwise focus goes down
+    `optron_focus_time` ms before the shutter line. The shutter line is held until the release edge
+    plus `release_lag`, which is the exposure time in bulb mode.
+    """
+
+    enable_key = "optron_enable"
+    effect_source = "loopback"
+
+    def __init__(self, config: Config, focus_pin: int, shutter_pin: int):
+        super().__init__(config)
+        self.focus_pin = focus_pin
+        self.shutter_pin = shutter_pin
+        self.prefocus: bool = self.config.optron_prefocus.value
+        self.focus_time: int = self.config.optron_focus_time.value
+        self.last_latency: Optional[float] = None  # s from the trigger edge to the shutter line
+        self.latencies: deque[float] = deque(maxlen=100)
+        if self.enabled:
+            self.enable()
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "optron_prefocus":
+            self.prefocus = event.new_value
+            if self.enabled and self.phase is OutputPhase.IDLE:
+                GPIO.output(self.focus_pin, GPIO.HIGH if self.prefocus else GPIO.LOW)
+        elif event.key == "optron_focus_time":
+            self.focus_time = event.new_value
+        elif event.key == self.enable_key:
+            if event.new_value:
+                self.enable()
+            else:
+                self.disable()
+
+    def enable(self) -> None:
+        super().enable()
+
+        GPIO.setup(self.shutter_pin, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(self.focus_pin, GPIO.OUT, initial=GPIO.HIGH if self.prefocus else GPIO.LOW)
+
+    def disable(self) -> None:
+        super().disable()
+
+        GPIO.output(self.shutter_pin, GPIO.LOW)
+        GPIO.output(self.focus_pin, GPIO.LOW)
+        GPIO.cleanup((self.focus_pin, self.shutter_pin))
+
+    @property
+    def latency_summary(self) -> dict[str, float]:
+        return summarize(self.latencies)
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        logger.info(f"-> OptronOutputDevice Shutter {self.shutter_lag}")
+        now = time.monotonic()
+        if deadline is None:
+            deadline = now + self.shutter_lag / 1000
+        if not self.prefocus:
+            GPIO.output(self.focus_pin, GPIO.HIGH)
+            deadline = max(deadline, now + self.focus_time / 1000)
+
+        fired = False
+        try:
+            await sleep_until(deadline)
+            GPIO.output(self.shutter_pin, GPIO.HIGH)
+            self.last_latency = self.mark_fired() - (self.edge_at or now)
+            fired = True
+        finally:
+            if not fired:
+                # cancelled before the shutter line went up, leave the camera as it was
+                GPIO.output(self.shutter_pin, GPIO.LOW)
+                GPIO.output(self.focus_pin, GPIO.HIGH if self.prefocus else GPIO.LOW)
+
+        self.latencies.append(self.last_latency)
+        logger.info(f"<- OptronOutputDevice Shutter {self.shutter_lag}, latency {self.last_latency * 1000:.3f} ms")
+
+    async def do_release(self) -> None:
+        logger.info(f"-> OptronOutputDevice Release {self.release_lag}")
+        await asyncio.sleep(self.release_lag / 1000)
+        GPIO.output(self.shutter_pin, GPIO.LOW)
+        if not self.prefocus:
+            GPIO.output(self.focus_pin, GPIO.LOW)
+        logger.info(f"<- OptronOutputDevice Release {self.release_lag}")
+
+
 class BluetoothOuputDevice(OutputDevice):
+    """Sony camera through the BLE remote protocol.
+
+    With `bt_armed` the shutter button is kept half pressed while connected: focus is locked, refreshed
+    every `ARM_REFRESH` s and re-acquired after `F_LOST`, so a trigger sends only `SFD` and `SFU`.
+    The latency from the trigger edge to `S_ACTIVE` is kept per mode, "armed" or "cold".
+
+    With `bt_burst` above 1 a trigger fires that many frames, each `SFD` going out as soon as the camera
+    reports `S_READY` for the previous frame, or after `FRAME_TIMEOUT` s if it never does.
+
+    `shutter_listener` is told about shutter presses made on the camera itself, shots this device fired
+    are not reported.
+
+    The camera address and the command/notify handles are stored under `CAMERA_KEY`, so the next start
+    connects directly instead of scanning.
+    """
+
+    enable_key = "bt_enable"
+    effect_source = "notify"
+
+    ARM_REFRESH = 10.0  # s, cameras drop an idle focus lock after a while
+    FOCUS_TIMEOUT = 2.0  # s to wait for F_ACQUIRED before half-pressing again
+    FRAME_TIMEOUT = 2.0  # s to wait for S_ACTIVE and S_READY of a frame before moving on
+    OWN_SHOT_WINDOW = 1.0  # s after firing in which S_ACTIVE is taken for our own shot
+    CONNECT_TIMEOUT = 10.0  # s
+    CACHED_CONNECT_TIMEOUT = 5.0  # s, about what a scan takes, so a camera that is off does not cost more
+    CAMERA_KEY = "bt:camera"  # storage key of the last camera address and GATT handles
+
     def __init__(self, config: Config):
         super().__init__(config)
         self.device: Optional[Union[str, BLEDevice]] = None
@@ -218,98 +604,316 @@ class BluetoothOuputDevice(OutputDevice):
         self.command_handle = None
         self.notify_handle = None
         self.af_enabled = False
-        self._focus_acquired = False
-        self._shutter_active = False
+        self.focus_acquired = asyncio.Event()
+        self.focus_lost = asyncio.Event()
+        self.focus_lost.set()
+        self.shutter_ready = asyncio.Event()
+        self.shutter_ready.set()
+        self.ready_at: Optional[float] = None  # monotonic time of the last S_READY
+        self.last_burst: dict[str, Any] = {}
+        self.shutter_listener: Optional[Callable[[bool, float], None]] = None  # (pressed, notification time)
+        self._forwarded = False  # the last S_ACTIVE went to shutter_listener, so does its S_READY
+        self.writer = CommandWriter(self.write_gatt_char)
+        self._arm_task: Optional[asyncio.Task[None]] = None
+        self._shot_mode: Optional[str] = None  # mode of the shot waiting for S_ACTIVE
+        self.latencies: dict[str, deque[float]] = {"armed": deque(maxlen=100), "cold": deque(maxlen=100)}
+        # read on every trigger, so kept here instead of going to the config storage
+        self.armed = bool(self.config.bt_armed.value)
+        self.frames = max(self.config.bt_burst.value, 1)
 
     @property
-    def enabled(self) -> bool:
-        return self.config.bt_enable.value  # type: ignore
+    def connected(self) -> bool:
+        return self.client is not None and self.command_handle is not None and self.client.is_connected
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "bt_burst":
+            self.frames = max(event.new_value, 1)
+        if event.key != "bt_armed":
+            return
+
+        self.armed = bool(event.new_value)
+        if self.armed:
+            self.arm()
+        else:
+            await self.disarm()
 
     def notification_handler(self, characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
+        now = time.monotonic()
         logger.info("BLE notification_handler %s: %r", characteristic, data)
         if data == F_ACQUIRED:
-            self._focus_acquired = True
+            self.focus_lost.clear()
+            self.focus_acquired.set()
         if data == S_ACTIVE:
-            self._shutter_active = True
+            self._forwarded = self.shutter_listener is not None and not self.own_shot(now)
+            self.shutter_ready.clear()
+            self.mark_effect(now)
+            self.record_latency()
+            if self._forwarded:
+                self.shutter_listener(True, now)  # type: ignore
         if data == S_READY:
-            self._shutter_active = False
+            self.ready_at = now
+            self.shutter_ready.set()
+            if self._forwarded:
+                self._forwarded = False
+                self.shutter_listener(False, now)  # type: ignore
         if data == F_LOST:
-            self._focus_acquired = False
+            self.focus_acquired.clear()
+            self.focus_lost.set()
+
+    def own_shot(self, now: float) -> bool:
+        if self.phase is not OutputPhase.IDLE:
+            return True
+        return self.fired_at is not None and now - self.fired_at < self.OWN_SHOT_WINDOW
+
+    def record_latency(self) -> None:
+        if self._shot_mode is None or self.shutter_started_at is None or self.effect_at is None:
+            return
+
+        latency = self.effect_at - self.shutter_started_at
+        self.latencies[self._shot_mode].append(latency)
+        logger.info(f"BluetoothOuputDevice {self._shot_mode} trigger to S_ACTIVE {latency * 1000:.1f} ms")
+        self._shot_mode = None
+
+    @property
+    def latency_summary(self) -> dict[str, dict[str, float]]:
+        return {mode: summarize(latencies) for mode, latencies in self.latencies.items() if latencies}
+
+    def load_camera(self) -> Optional[dict[str, Any]]:
+        raw = self.config.storage.get(self.CAMERA_KEY)
+        return json.loads(raw) if raw else None
+
+    def save_camera(self) -> None:
+        camera = {"address": self.client.address, "command": self.command_handle, "notify": self.notify_handle}  # type: ignore
+        self.config.storage[self.CAMERA_KEY] = json.dumps(camera)
+
+    async def connect(self, device: Union[str, BLEDevice], cached: Optional[dict[str, Any]] = None) -> None:
+        timeout = self.CACHED_CONNECT_TIMEOUT if cached is not None else self.CONNECT_TIMEOUT
+        self.client = BleakClient(device, timeout=timeout, disconnected_callback=self.on_disconnected)
+        await self.client.connect()
+        logger.debug(f"Connected: {self.client.is_connected}")
+
+        if cached is not None:
+            # handles only change with the camera firmware, a cheap lookup confirms they still fit
+            command = self.client.services.get_characteristic(cached["command"])
+            notify = self.client.services.get_characteristic(cached["notify"])
+            if command and notify and command.uuid.startswith("0000ff01") and notify.uuid.startswith("0000ff02"):
+                self.command_handle, self.notify_handle = command.handle, notify.handle
+                self.writer.without_response = "write-without-response" in command.properties
+                return
+            logger.info("BluetoothOuputDevice cached handles are stale, looking them up")
+
+        for service in self.client.services:
+            if service.uuid.lower() != "8000FF00-FF00-FFFF-FFFF-FFFFFFFFFFFF".lower():
+                continue
+
+            for char in service.characteristics:
+                if char.uuid.startswith("0000ff01"):
+                    self.command_handle = char.handle
+                    self.writer.without_response = "write-without-response" in char.properties
+
+                if char.uuid.startswith("0000ff02"):
+                    self.notify_handle = char.handle
+
+    def on_disconnected(self, client: BleakClient) -> None:
+        logger.info(f"BluetoothOuputDevice {client.address} disconnected, command queue: {self.writer.summary()}")
+        self.writer.stop()
 
     async def search(self) -> None:
-        logger.debug("BluetoothOuputDevice.search")
-        devices = await get_sony_device()
-        if len(devices):
-            self.client = BleakClient(devices[0][0])
-            await self.client.connect()
-            logger.debug(f"Connected: {self.client.is_connected}")
-
-            for service in self.client.services:
-                if service.uuid.lower() != "8000FF00-FF00-FFFF-FFFF-FFFFFFFFFFFF".lower():
-                    continue
+        """Connects to the last camera straight away, scans for one only when that fails."""
 
-                for char in service.characteristics:
-                    if char.uuid.startswith("0000ff01"):
-                        self.command_handle = char.handle
+        logger.debug("BluetoothOuputDevice.search")
+        started_at = time.monotonic()
+        cached = self.load_camera()
+        if cached is not None:
+            try:
+                await self.connect(cached["address"], cached)
+            except (BleakError, asyncio.TimeoutError, OSError) as e:
+                logger.info(f"BluetoothOuputDevice cached camera {cached['address']} unavailable: {e!r}")
+                self.client = None
 
-                    if char.uuid.startswith("0000ff02"):
-                        self.notify_handle = char.handle
+        if not self.connected:
+            devices = await get_sony_device()
+            if len(devices):
+                await self.connect(devices[0][0])
 
-        if self.notify_handle:
+        if self.notify_handle and self.client is not None:
             await self.client.start_notify(self.notify_handle, self.notification_handler)
 
-    async def shutter(self, bulb_mode: bool = False) -> None:
-        if not self.client or not self.command_handle or self._shutter_active:
+        if self.connected:
+            self.save_camera()
+            logger.info(f"BluetoothOuputDevice ready in {time.monotonic() - started_at:.2f} s")
+
+        if self.armed:
+            self.arm()
+
+    async def write(self, *commands: bytes) -> None:
+        """Sends `commands` back to back through the command queue."""
+
+        await self.writer.send(*commands)
+
+    async def write_gatt_char(self, command: bytes, response: bool) -> None:
+        with self.tracer.span("BleakClient.write_gatt_char", command=command.hex()):
+            await self.client.write_gatt_char(self.command_handle, command, response=response)  # type: ignore
+
+    def arm(self) -> None:
+        if self.connected and (self._arm_task is None or self._arm_task.done()):
+            self._arm_task = asyncio.create_task(self.keep_armed())
+
+    async def disarm(self) -> None:
+        if self._arm_task is not None:
+            self._arm_task.cancel()
+            await asyncio.wait({self._arm_task})
+            self._arm_task = None
+        if self.connected and self.phase is OutputPhase.IDLE:
+            await self.write(SHU)
+
+    async def keep_armed(self) -> None:
+        """Holds the half press, refocusing after `F_LOST` and every `ARM_REFRESH` s, never during a shot."""
+
+        refresh = False
+        while self.armed and self.connected:
+            await self._idle.wait()
+            if refresh or not self.focus_acquired.is_set():
+                if self.focus_acquired.is_set():
+                    self.focus_acquired.clear()  # F_LOST follows, the lock must not be taken for the new one
+                    await self.write(SHU)
+                await self.write(SHD)
+                try:
+                    await asyncio.wait_for(self.focus_acquired.wait(), self.FOCUS_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"BluetoothOuputDevice no focus lock in {self.FOCUS_TIMEOUT} s, retrying")
+                    continue
+
+            try:
+                await asyncio.wait_for(self.focus_lost.wait(), self.ARM_REFRESH)
+            except asyncio.TimeoutError:
+                refresh = True
+            else:
+                refresh = False
+                logger.info("BluetoothOuputDevice focus lost, re-arming")
+
+    async def frame_done(self) -> bool:
+        """Waits for `S_ACTIVE` and then `S_READY` of the frame just fired, False on `FRAME_TIMEOUT`."""
+
+        async def active_then_ready() -> None:
+            await self.effect_seen.wait()
+            await self.shutter_ready.wait()
+
+        try:
+            await asyncio.wait_for(active_then_ready(), self.FRAME_TIMEOUT)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def burst(self, frames: int) -> None:
+        """Fires `frames` frames back to back, paced by the camera's `S_READY`."""
+
+        actives: list[float] = []  # S_ACTIVE times
+        gaps: list[float] = []  # s from S_READY of a frame to S_ACTIVE of the next one
+        timeouts = 0
+        ready_at = None
+        for frame in range(frames):
+            self.effect_seen.clear()
+            await self.write(SFD, SFU)
+            if not await self.frame_done():
+                timeouts += 1
+                ready_at = None
+                logger.warning(f"BluetoothOuputDevice burst frame {frame} not ready in {self.FRAME_TIMEOUT} s")
+                continue
+
+            actives.append(self.effect_at)  # type: ignore
+            if ready_at is not None:
+                gaps.append(self.effect_at - ready_at)  # type: ignore
+            ready_at = self.ready_at
+
+        duration = actives[-1] - actives[0] if len(actives) > 1 else 0.0
+        gap = summarize(gaps)
+        self.last_burst = {
+            "frames": frames,
+            "fps": (len(actives) - 1) / duration if duration else 0.0,
+            "gap_p50": gap.get("p50", 0.0),
+            "gap_max": gap.get("max", 0.0),
+            "timeouts": timeouts,
+        }
+        logger.info(
+            f"BluetoothOuputDevice burst {frames} frames, {self.last_burst['fps']:.2f} fps,"
+            f" idle gap p50 {self.last_burst['gap_p50'] * 1000:.1f} ms max {self.last_burst['gap_max'] * 1000:.1f} ms,"
+            f" {timeouts} timeouts"
+        )
+
+    async def do_shutter(self, deadline: Optional[float] = None, bulb_mode: bool = False) -> None:
+        if not self.client or not self.command_handle or not self.shutter_ready.is_set():
+            return
+
+        frames = self.frames
+        if self.armed and self.focus_acquired.is_set():
+            # already half pressed and focused, only the full press is left
+            self._shot_mode = "armed"
+            await self.wait_shutter_lag(deadline)
+            self.mark_fired()
+            if frames > 1:
+                await self.burst(frames)
+            else:
+                await self.write(SFD, SFU)
+            logger.info(f"<- BluetoothOuputDevice armed Shutter {self.shutter_lag}")
             return
 
-        self.can_release = False
-        await self.client.write_gatt_char(self.command_handle, SHU)
+        self._shot_mode = "cold"
+        await self.write(SHU)
         if self.af_enabled:
-            await self.client.write_gatt_char(self.command_handle, SHD)
-            while not self._focus_acquired:
-                await asyncio.sleep(0.01)
+            await self.write(SHD)
+            await self.focus_acquired.wait()
+
+        await self.wait_shutter_lag(deadline)
 
-        if self.shutter_lag:
-            await asyncio.sleep(self.shutter_lag / 1000)
+        self.mark_fired()
+        if frames > 1:
+            await self.burst(frames)
+        else:
+            self.effect_seen.clear()
+            await self.write(SFD, SFU)
 
-        await self.client.write_gatt_char(self.command_handle, SFD)
-        await self.client.write_gatt_char(self.command_handle, SFU)
+            if self.af_enabled and not bulb_mode:
+                await self.frame_done()
 
         if self.af_enabled:
-            while not bulb_mode and self._shutter_active:
-                await asyncio.sleep(0.01)
-            await self.client.write_gatt_char(self.command_handle, SHU)
+            await self.write(SHU)
 
         logger.info(f"<- BluetoothOuputDevice Shutter {self.shutter_lag}")
-        self.can_release = True
 
-    async def release(self, bulb_mode: bool = False) -> None:
+    async def do_release(self, bulb_mode: bool = False) -> None:
         logger.info(f"-> BluetoothOuputDevice Release {self.release_lag}")
-        logger.info(f"\t{bulb_mode} {self._shutter_active}")
+        logger.info(f"\t{bulb_mode} {not self.shutter_ready.is_set()}")
         if not self.client or not self.command_handle or not bulb_mode:
             return
 
-        max_limit = 100
-        while not self.can_release and not self._shutter_active and max_limit:
-            max_limit -= 1
-            await asyncio.sleep(0.01)
-
-        logger.info(f"-> BluetoothOuputDevice Release {self.release_lag} {max_limit}")
         await asyncio.sleep(self.release_lag / 1000)
         # in bulb mode to release the shutter you should press button again (see https://github.com/coral/freemote/issues/6)
-        await self.client.write_gatt_char(self.command_handle, SFD)
-        await self.client.write_gatt_char(self.command_handle, SFU)
+        await self.write(SFD, SFU)
         logger.info(f"<- BluetoothOuputDevice Release {self.release_lag}")
 
 
 class GPhotoOutputDevice(OutputDevice):
+    enable_key = "gphoto_enable"
+    effect_source = "capture"
+
     def __init__(self, config: Config):
         super().__init__(config)
         self.client = None
+        self.camera: Optional[gp.Camera] = None  # set while the device is enabled
 
         if self.enabled:
             self.enable()
 
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key != self.enable_key:
+            return
+
+        if event.new_value:
+            self.enable()
+        else:
+            self.disable()
+
     def enable(self) -> None:
         super().enable()
         self.camera = gp.Camera()
@@ -320,7 +924,7 @@ class GPhotoOutputDevice(OutputDevice):
 
     async def search(self) -> None:
         logger.debug("GPhotoOutputDevice.search")
-        while True:
+        while self.camera is not None:
             try:
                 self.camera.init()
             except gp.GPhoto2Error as ex:
@@ -333,10 +937,7 @@ class GPhotoOutputDevice(OutputDevice):
             # operation completed successfully so exit loop
             break
 
-    async def shutter(self) -> None:
-        if not self.enabled:
-            return
-
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
         # config = self.camera.get_single_config("shutterspeed")
         # shutterspeed = config.get_value()
         # config = self.camera.get_single_config("iso")
@@ -348,17 +949,16 @@ class GPhotoOutputDevice(OutputDevice):
         # f-number
 
         logger.info(f"-> GPhotoOutputDevice Shutter {self.shutter_lag}")
-        self.can_release = False
-        if self.shutter_lag:
-            await asyncio.sleep(self.shutter_lag / 1000)
+        await self.wait_shutter_lag(deadline)
+        if self.camera is None:  # disabled during the shutter lag
+            return
+
+        self.mark_fired()
         self.camera.trigger_capture()
+        self.mark_effect()
         logger.info(f"<- GPhotoOutputDevice Shutter {self.shutter_lag}")
-        self.can_release = True
-
-    async def release(self) -> None:
-        if not self.enabled:
-            return
 
+    async def do_release(self) -> None:
         logger.info(f"-> GPhotoOutputDevice Release {self.release_lag}")
         await asyncio.sleep(self.release_lag / 1000)
         logger.info(f"<- GPhotoOutputDevice Release {self.release_lag}")
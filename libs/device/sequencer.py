@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+from collections.abc import Collection
+from functools import partial
+from typing import Any, Optional
+
+import RPi.GPIO as GPIO
+
+from libs.device.output import OutputDevice
+from libs.eventtypes import ConfigChangeEvent
+from libs.pins import RESERVED
+from libs.pulse import PulseEngine
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+Edge = tuple[float, int, bool]  # offset from the trigger in seconds, BCM pin, level
+
+TIMELINES_PATH = "timelines.json"  # next to the `storage` dbm, which app.py keeps open
+HEADER_PINS = range(28)
+
+EXAMPLE_TIMELINE = {
+    "channels": {"valve": 12, "flash": 7},
+    "pulses": [["valve", 0, 12], ["valve", 80, 90], ["flash", 310, 312]],
+}
+
+
+def load_timelines(path: str) -> dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)  # type: ignore[no-any-return]
+    except FileNotFoundError:
+        return {}
+
+
+def save_timelines(path: str, timelines: dict[str, Any]) -> None:
+    # the app may read the file at any time, so it never sees a partly written one
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(timelines, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_timeline(path: str, slot: int) -> Optional[dict[str, Any]]:
+    return load_timelines(path).get(str(slot))
+
+
+def save_timeline(path: str, slot: int, timeline: dict[str, Any]) -> None:
+    compile_timeline(timeline)  # refuse to store what cannot be played
+    timelines = load_timelines(path)
+    timelines[str(slot)] = timeline
+    save_timelines(path, timelines)
+
+
+def delete_timeline(path: str, slot: int) -> bool:
+    timelines = load_timelines(path)
+    if timelines.pop(str(slot), None) is None:
+        return False
+    save_timelines(path, timelines)
+    return True
+
+
+def compile_timeline(timeline: dict[str, Any], reserved: Collection[int] = RESERVED) -> list[Edge]:
+    """Turns a timeline into edges sorted by time.
+
+    A timeline is `{"channels": {name: pin}, "pulses": [[channel, start_ms, end_ms], ...]}`,
+    a channel is a name from `channels` or a BCM pin number. Pins in `reserved` belong to the HAT,
+    the OLED or other devices and are refused. Pulses on the same pin must not overlap.
+    At equal times falling edges go first, so back-to-back pulses on one pin stay separate.
+    """
+
+    channels: dict[str, int] = timeline.get("channels", {})
+    edges: list[Edge] = []
+    busy: dict[int, list[tuple[float, float]]] = {}
+    for channel, start, end in timeline.get("pulses", []):
+        pin = channels.get(channel, channel) if isinstance(channel, str) else channel
+        if not isinstance(pin, int):
+            raise ValueError(f"Unknown channel {channel!r}")
+        if pin not in HEADER_PINS:
+            raise ValueError(f"Pin {pin} of channel {channel!r} is not on the header")
+        if pin in reserved:
+            raise ValueError(f"Pin {pin} of channel {channel!r} is used by the HAT or another device")
+        if not 0 <= start < end:
+            raise ValueError(f"Bad pulse {channel!r} {start}-{end} ms")
+        if any(start < other_end and other_start < end for other_start, other_end in busy.get(pin, [])):
+            raise ValueError(f"Pulse {channel!r} {start}-{end} ms overlaps another pulse on pin {pin}")
+
+        busy.setdefault(pin, []).append((start, end))
+        edges.append((start / 1000, pin, True))
+        edges.append((end / 1000, pin, False))
+
+    edges.sort(key=lambda edge: (edge[0], edge[2]))
+    return edges
+
+
+class SequencerOutputDevice(OutputDevice):
+    """Plays a multi-channel pulse timeline (valves, flashes, camera) on every shutter.
+
+    The timeline comes from the preset slot `sequencer_preset` of the JSON file at `path`, which
+    `timeline.py` edits while the app runs, the file is checked for changes before every run. All edges
+    are handed to a high-priority `PulseEngine` thread at once, each with its absolute deadline, and the
+    achieved edge times are logged after every run.
+    """
+
+    enable_key = "sequencer_enable"
+    effect_source = "loopback"
+
+    def __init__(self, config: Config, path: str = TIMELINES_PATH, priority: int = 50):
+        super().__init__(config)
+        self.path = path
+        self.priority = priority
+        self.edges: list[Edge] = []
+        self.pins: set[int] = set()
+        self.pulse_engine: Optional[PulseEngine] = None
+        self.last_run: list[tuple[float, int, bool, float]] = []  # requested offset, pin, level, error
+        self._loaded: Optional[tuple[int, float]] = None  # slot and file mtime of the current edges
+        if self.enabled:
+            self.enable()
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "sequencer_preset" and self.enabled:
+            self.load()
+        if event.key != self.enable_key:
+            return
+
+        if event.new_value:
+            self.enable()
+        else:
+            self.disable()
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self.pulse_engine is None:
+            self.pulse_engine = PulseEngine(name="SequencerOutputDevice", priority=self.priority)
+        self.load()
+
+    def disable(self) -> None:
+        super().disable()
+
+        if self.pulse_engine is not None:
+            self.pulse_engine.stop()
+            self.pulse_engine = None
+        if self.pins:
+            GPIO.cleanup(tuple(self.pins))
+            self.pins = set()
+        self.edges = []
+        self._loaded = None
+
+    def load(self) -> None:
+        slot: int = self.config.sequencer_preset.value
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = 0.0
+        if self._loaded == (slot, mtime):
+            return
+
+        self._loaded = (slot, mtime)
+        try:
+            timeline = load_timeline(self.path, slot)
+            edges = compile_timeline(timeline) if timeline else []
+        except ValueError as e:  # json.JSONDecodeError included
+            logger.error(f"SequencerOutputDevice timeline {slot} is broken: {e}")
+            return
+
+        if edges != self.edges:
+            for pin in {pin for _, pin, _ in edges} - self.pins:
+                GPIO.setup(pin, GPIO.OUT, initial=GPIO.LOW)
+                self.pins.add(pin)
+            self.edges = edges
+            logger.info(f"SequencerOutputDevice timeline {slot}: {len(edges)} edges on pins {sorted(self.pins)}")
+
+    def all_off(self) -> None:
+        for pin in self.pins:
+            GPIO.output(pin, GPIO.LOW)
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        self.load()
+        if self.pulse_engine is None or not self.edges:
+            return
+
+        logger.info(f"-> SequencerOutputDevice Shutter {self.shutter_lag}")
+        start = deadline if deadline is not None else time.monotonic() + self.shutter_lag / 1000
+        engine = self.pulse_engine
+        runs = [
+            engine.edge(start + offset, partial(GPIO.output, pin, level))
+            for offset, pin, level in self.edges
+        ]
+        try:
+            errors = await asyncio.gather(*runs)
+        except asyncio.CancelledError:
+            self.all_off()
+            raise
+
+        self.fired_at = start + errors[0]
+        self.last_run = [(offset, pin, level, error) for (offset, pin, level), error in zip(self.edges, errors)]
+        logger.info(
+            "SequencerOutputDevice run: "
+            + ", ".join(
+                f"{pin}{'+' if level else '-'} {(offset + error) * 1000:.3f} ms"
+                for offset, pin, level, error in self.last_run
+            )
+        )
+        logger.info(f"<- SequencerOutputDevice Shutter {self.shutter_lag}")
+
+    async def do_release(self) -> None:
+        # the timeline is over by now
+        self.all_off()
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import statistics
+import threading
+import time
+
+from collections import deque
+from collections.abc import Iterable
+from typing import Callable, Optional
+
+import RPi.GPIO as GPIO
+
+from libs.device.input import InputDevice
+from libs.eventtypes import ConfigChangeEvent
+from menu.data import Config
+
+logger = logging.getLogger(__name__)
+
+SPEED_OF_SOUND = 34300  # cm/s at 20℃
+MAX_ECHO_TIME = 0.038  # HC-SR04 reports "no echo" with a 38 ms pulse
+
+EdgeCallback = Callable[[bool, int], None]  # (rising, monotonic_ns)
+
+
+def echo_to_distance(duration_ns: int) -> float:
+    """Converts the echo pulse width into a distance in centimeters."""
+    return duration_ns * SPEED_OF_SOUND / 2 / 1e9
+
+
+class EchoBackend:
+    def setup(self, on_edge: EdgeCallback) -> None:
+        pass
+
+    def ping(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+
+class GPIOEchoBackend(EchoBackend):
+    """HC-SR04 on two GPIO pins, the echo pin goes through a 5V -> 3.3V divider."""
+
+    def __init__(self, trigger_pin: int, echo_pin: int) -> None:
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin
+        self._on_edge: Optional[EdgeCallback] = None
+        self._high = False  # level after the last edge seen, the echo is low between pings
+
+    def setup(self, on_edge: EdgeCallback) -> None:
+        self._on_edge = on_edge
+        GPIO.setup(self.trigger_pin, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(self.echo_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        GPIO.add_event_detect(self.echo_pin, GPIO.BOTH, callback=self._callback)
+
+    def _callback(self, channel: int) -> None:
+        # edges alternate, reading the pin here could already see the next level on a short echo
+        timestamp = time.monotonic_ns()
+        self._high = not self._high
+        if self._on_edge is not None:
+            self._on_edge(self._high, timestamp)
+
+    def ping(self) -> None:
+        self._high = False
+        GPIO.output(self.trigger_pin, GPIO.HIGH)
+        time.sleep(0.00001)
+        GPIO.output(self.trigger_pin, GPIO.LOW)
+
+    def cleanup(self) -> None:
+        GPIO.remove_event_detect(self.echo_pin)
+        GPIO.cleanup((self.trigger_pin, self.echo_pin))
+
+
+class SimulatedEchoBackend(EchoBackend):
+    """Replays distances (cm, None for a lost echo) as echo edges, one per ping."""
+
+    def __init__(self, distances: Iterable[Optional[float]], echo_delay: float = 0.0005) -> None:
+        self._distances = iter(distances)
+        self.echo_delay = echo_delay
+        self._on_edge: Optional[EdgeCallback] = None
+
+    def setup(self, on_edge: EdgeCallback) -> None:
+        self._on_edge = on_edge
+
+    def ping(self) -> None:
+        distance = next(self._distances, None)
+        if distance is None or self._on_edge is None:
+            return
+
+        rise = time.monotonic_ns() + int(self.echo_delay * 1e9)
+        self._on_edge(True, rise)
+        self._on_edge(False, rise + int(distance * 2 / SPEED_OF_SOUND * 1e9))
+
+
+class UltrasonicInputDevice(InputDevice):
+    """Distance trigger: shutter when an object is inside the [near, far] window, release when it leaves.
+
+    Echo pulse width comes from the timestamps of the echo edges, the ping thread only waits
+    for the falling edge, so nothing busy-waits on the pin. Decisions use the median
+    of the last `window` measurements to ignore single stray echoes.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        backend: EchoBackend,
+        window: int = 5,
+        interval: int = 60,
+    ):
+        super().__init__(config)
+        self.loop = asyncio.get_event_loop()
+        self.backend = backend
+        self.interval = interval  # ms between pings, the sensor needs ~60 ms for echoes to die out
+        self.distances: deque[float] = deque(maxlen=window)
+
+        self.near = self.config.distance_near.value
+        self.far = self.config.distance_far.value
+        self.pings = 0
+        self.lost_echoes = 0
+        self.last_distance: Optional[float] = None
+        self.last_trigger: Optional[float] = None
+        self._active = False
+        self._rise: Optional[int] = None
+        self._duration: Optional[int] = None
+        self._echo = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.distance_trigger_enable.value
+
+    def enable(self) -> None:
+        super().enable()
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self.backend.setup(self.on_edge)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="UltrasonicInputDevice", daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        super().disable()
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.backend.cleanup()
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "distance_near":
+            self.near = event.new_value
+        elif event.key == "distance_far":
+            self.far = event.new_value
+        elif event.key == "distance_trigger_enable":
+            if event.new_value:
+                self.enable()
+            else:
+                self.disable()
+
+    def on_edge(self, rising: bool, timestamp: int) -> None:
+        if rising:
+            self._rise = timestamp
+        elif self._rise is not None:
+            self._duration = timestamp - self._rise
+            self._rise = None
+            self._echo.set()
+
+    def measure(self) -> Optional[float]:
+        """Sends one ping and returns the raw distance in cm, None when no echo came back."""
+
+        self._echo.clear()
+        self._rise = None
+        self._duration = None
+        self.pings += 1
+        self.backend.ping()
+
+        if not self._echo.wait(MAX_ECHO_TIME + 0.01) or self._duration is None or self._duration >= MAX_ECHO_TIME * 1e9:
+            self.lost_echoes += 1
+            return None
+
+        return echo_to_distance(self._duration)
+
+    def run(self, count: Optional[int] = None) -> None:
+        """Pings every `interval` ms until disabled, or `count` times."""
+
+        deadline = time.monotonic()
+        while not self._stop.is_set() and (count is None or count > 0):
+            distance = self.measure()
+            if distance is not None:
+                self.process(distance, time.monotonic())
+            if count is not None:
+                count -= 1
+
+            deadline += self.interval / 1000
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                deadline = time.monotonic()
+
+    def process(self, distance: float, timestamp: float) -> bool:
+        self.distances.append(distance)
+        self.last_distance = statistics.median(self.distances)
+        inside = self.near <= self.last_distance <= self.far
+
+        if inside != self._active:
+            logger.debug(f"UltrasonicInputDevice {'shutter' if inside else 'release'} at {self.last_distance:.1f}cm")
+            self._active = inside
+            self._last_value = int(inside)
+            if inside:
+                self.last_trigger = timestamp
+
+            if self.notify_callback is not None:
+                asyncio.run_coroutine_threadsafe(self.notify_callback(inside), self.loop)
+
+        return inside
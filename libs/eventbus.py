@@ -5,8 +5,6 @@ from collections import defaultdict
 from collections.abc import Coroutine
 from typing import Any, Callable
 
-from typing_extensions import Never
-
 from libs.eventtypes import Event
 from libs.utils import Singleton
 
@@ -18,17 +16,16 @@ Here's a breakdown of the Coroutine[Any, Any, Any]:
     Any: This is the type of the values that the coroutine yields. Any means that the coroutine can yield values of any type.
 
     Any: This is the type of the value that the coroutine returns. Any means that the coroutine can return a value of any type.
-    Never: This is a type hint that indicates that the coroutine will never raise an exception.
 """
 logger = logging.getLogger(__name__)
 
 
-CallbackType = Callable[[Event], Coroutine[Any, Any, Never]]
+CallbackType = Callable[[Any], Coroutine[Any, Any, None]]  # listeners take a subclass of Event
 
 
 class EventBusDefaultDict(metaclass=Singleton):
     def __init__(self) -> None:
-        self.listeners: defaultdict[type, set[CallbackType]] = defaultdict(set)  # type: ignore
+        self.listeners: defaultdict[type, set[CallbackType]] = defaultdict(set)
 
     def add_listener(self, event_type: type, listener: CallbackType) -> None:
         self.listeners[event_type].add(listener)
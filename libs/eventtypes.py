@@ -62,3 +62,21 @@ class HWInfoUpdateEvent(Event):
     temperature: int
     ip: str
     is_charging: int
+
+
+@dataclass(frozen=True)
+class NetworkStatsEvent(Event):
+    received: int
+    accepted: int
+    duplicates: int
+    malformed: int
+    latency_p50: float  # ms
+    latency_p99: float  # ms
+    latency_max: float  # ms
+
+
+@dataclass(frozen=True)
+class AdmissionStatsEvent(Event):
+    admitted: int
+    deferred: int
+    dropped: int
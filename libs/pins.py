@@ -0,0 +1,40 @@
+"""BCM pins of the Pi Zero header: the 1.3" OLED HAT and the devices wired next to it."""
+
+# OLED HAT joystick and keys, active low
+BUTTON_LEFT = 5
+BUTTON_RIGHT = 26
+BUTTON_ENTER = 13
+HAT_KEYS = (5, 6, 13, 19, 26, 21, 20, 16)  # joystick left, up, press, down, right, KEY1, KEY2, KEY3
+
+# SH1106 on SPI0: CE0, MISO, MOSI, SCLK, DC, RST
+OLED = (8, 9, 10, 11, 24, 25)
+I2C = (2, 3)  # the accelerometer
+ID_EEPROM = (0, 1)
+
+DIGITAL_INPUT = 22
+EMITTER_OUTPUT = 27
+RPI0_LED = 29  # on board, not on the header
+ACCEL_INT = 17
+SONAR_TRIGGER = 23
+SONAR_ECHO = 4
+OPTRON_FOCUS = 14  # UART TX/RX, free as long as the serial console is off
+OPTRON_SHUTTER = 15
+LOOPBACK_INPUT = 18
+
+# what is left, 7 and 12, belongs to SequencerOutputDevice
+RESERVED = frozenset(
+    (
+        *HAT_KEYS,
+        *OLED,
+        *I2C,
+        *ID_EEPROM,
+        DIGITAL_INPUT,
+        EMITTER_OUTPUT,
+        ACCEL_INT,
+        SONAR_TRIGGER,
+        SONAR_ECHO,
+        OPTRON_FOCUS,
+        OPTRON_SHUTTER,
+        LOOPBACK_INPUT,
+    )
+)
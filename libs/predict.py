@@ -0,0 +1,87 @@
+import math
+import statistics
+
+from collections import deque
+from typing import NamedTuple, Optional
+
+MAD_TO_SIGMA = 1.4826
+
+
+class Prediction(NamedTuple):
+    period: float  # s
+    anchor: float  # monotonic time of a fitted event, every event is anchor + k * period
+    jitter: float  # s, robust standard deviation of the events around the fitted grid
+
+    def next_after(self, at: float) -> float:
+        return self.anchor + math.ceil((at - self.anchor) / self.period) * self.period
+
+
+class PeriodEstimator:
+    """Learns the period and phase of a periodic subject (drips, a fan, a pendulum) from trigger times.
+
+    Timestamps are fitted to a grid `anchor + n * period` with a Theil-Sen line (median of pairwise
+    slopes), so single spurious or missed events do not move the estimate. Gaps spanning missed
+    events count as several periods. `predict` returns None, i.e. reactive triggering, until there
+    are `min_events` events, while the jitter exceeds `max_jitter` of the period, or after the subject
+    stopped for `stale_periods` periods. An event after such a pause starts the window over.
+    """
+
+    def __init__(
+        self, window: int = 16, min_events: int = 6, max_jitter: float = 0.05, stale_periods: float = 2.5
+    ) -> None:
+        self.times: deque[float] = deque(maxlen=window)
+        self.min_events = min_events
+        self.max_jitter = max_jitter
+        self.stale_periods = stale_periods
+        self.last: Optional[Prediction] = None
+
+    def reset(self) -> None:
+        self.times.clear()
+        self.last = None
+
+    def add(self, timestamp: float) -> None:
+        # a pause of `stale_periods` ends the old grid, the subject may come back with another phase
+        if self.last is not None and self.times and timestamp - self.times[-1] > self.stale_periods * self.last.period:
+            self.reset()
+        self.times.append(timestamp)
+
+    def estimate(self) -> Optional[Prediction]:
+        if len(self.times) < self.min_events:
+            return None
+
+        times = list(self.times)
+        intervals = [b - a for a, b in zip(times, times[1:])]
+        rough = statistics.median(intervals)
+        if rough <= 0:
+            return None
+
+        # index every event on the rough grid, a long gap means events were missed in between,
+        # an event less than half a period after the previous one is a spurious extra and is left out
+        kept, indexes = [times[0]], [0]
+        for timestamp in times[1:]:
+            steps = round((timestamp - kept[-1]) / rough)
+            if steps:
+                kept.append(timestamp)
+                indexes.append(indexes[-1] + steps)
+        times = kept
+        if len(times) < self.min_events:
+            return None
+
+        pairs = [(i, j) for i in range(len(times)) for j in range(i + 1, len(times))]
+        period = statistics.median((times[j] - times[i]) / (indexes[j] - indexes[i]) for i, j in pairs)
+        anchor = statistics.median(t - n * period for t, n in zip(times, indexes))
+        residuals = [t - (anchor + n * period) for t, n in zip(times, indexes)]
+        jitter = MAD_TO_SIGMA * statistics.median(abs(residual) for residual in residuals)
+        return Prediction(period=period, anchor=anchor, jitter=jitter)
+
+    def predict(self, now: float) -> Optional[Prediction]:
+        """The current estimate if it is good enough to schedule on, None to trigger reactively."""
+
+        self.last = self.estimate()
+        if self.last is None:
+            return None
+        if self.last.jitter > self.max_jitter * self.last.period:
+            return None
+        if now - self.times[-1] > self.stale_periods * self.last.period:
+            return None
+        return self.last
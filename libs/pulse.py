@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from libs.utils import summarize
+
+logger = logging.getLogger(__name__)
+
+Action = Callable[[], None]
+
+
+def calibrate_spin(samples: int = 50, request: float = 0.001, margin: float = 0.0002) -> float:
+    """Measures how late `time.sleep` wakes up on this host and returns a spin window covering it.
+
+    The window is the 99th percentile overshoot plus `margin`, so the coarse sleep nearly always
+    ends before the deadline and the spin takes care of the rest.
+    """
+
+    overshoots = []
+    for _ in range(samples):
+        started_at = time.monotonic()
+        time.sleep(request)
+        overshoots.append(time.monotonic() - started_at - request)
+
+    overshoots.sort()
+    return max(overshoots[min(samples * 99 // 100, samples - 1)], 0.0) + margin
+
+
+class PulseStats:
+    """Achieved minus requested time of the last `size` edges, in seconds."""
+
+    def __init__(self, size: int = 1000) -> None:
+        self.errors: deque[float] = deque(maxlen=size)
+        self.late_wakeups = 0  # coarse sleeps that already overshot the deadline
+
+    def add(self, error: float) -> None:
+        self.errors.append(error)
+
+    def summary(self) -> dict[str, float]:
+        return summarize(self.errors)
+
+
+class PulseEngine:
+    """Runs actions (GPIO writes) at absolute `time.monotonic()` deadlines on a dedicated thread.
+
+    The thread sleeps until `spin` seconds before the earliest deadline and busy-waits the rest,
+    so the edge timing does not depend on the event loop or on `asyncio.sleep` overshoot.
+    The spin window is measured with `calibrate_spin` unless given.
+    """
+
+    def __init__(self, spin: Optional[float] = None, name: str = "PulseEngine", priority: int = 0) -> None:
+        self.spin = calibrate_spin() if spin is None else spin
+        self.priority = priority  # SCHED_FIFO priority of the thread, 0 keeps the default scheduling
+        self.stats = PulseStats()
+        self._heap: list[tuple[float, int, Action, Future[float]]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        logger.info(f"{name} started, spin window {self.spin * 1000:.3f} ms")
+
+    def schedule(self, deadline: float, action: Action) -> Future[float]:
+        """Queues `action` for `deadline`, the future resolves with the time the action ran at."""
+
+        future: Future[float] = Future()
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, next(self._counter), action, future))
+            self._cond.notify()
+        return future
+
+    async def edge(self, deadline: float, action: Action) -> float:
+        """Runs `action` at `deadline`, returns the error of the achieved time in seconds."""
+
+        achieved = await asyncio.wrap_future(self.schedule(deadline, action))
+        return achieved - deadline
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=1)
+
+        for _, _, _, future in self._heap:
+            future.cancel()
+        self._heap.clear()
+
+    def _set_priority(self) -> None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+        except (AttributeError, OSError) as e:
+            logger.warning(f"{self._thread.name} runs with the default priority: {e}")
+
+    def _run(self) -> None:
+        if self.priority:
+            self._set_priority()
+
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                # an earlier edge scheduled meanwhile wakes the wait up and takes over
+                remaining = self._heap[0][0] - self.spin - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                deadline, _, action, future = heapq.heappop(self._heap)
+
+            if not future.set_running_or_notify_cancel():
+                continue  # the waiting side was cancelled, e.g. a restarted output cycle
+
+            now = time.monotonic()
+            if now > deadline:
+                self.stats.late_wakeups += 1
+            while now < deadline:
+                now = time.monotonic()
+
+            try:
+                action()
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            achieved = time.monotonic()
+            self.stats.add(achieved - deadline)
+            future.set_result(achieved)
@@ -1,23 +1,179 @@
 import asyncio
+import logging
+import time
 
-from .device.input import GPIODevice
+from typing import Optional
+
+from menu.data import Config
+
+from .admission import AdmissionControl
+from .calibration import LoopbackProbe, calibrate, load_latency
+from .device.input import InputDevice
 from .device.output import OutputDevice
+from .eventbus import EventBusDefaultDict
+from .eventtypes import ConfigChangeEvent
+from .predict import PeriodEstimator
+from .trace import Tracer
+
+logger = logging.getLogger(__name__)
+
+PREDICT_MARGIN = 0.002  # s, a predicted shot is never scheduled closer than this to the edge that predicted it
 
 
 class Router:
-    def __init__(self, input_devices: list[GPIODevice], output_devices: list[OutputDevice]) -> None:
+    def __init__(
+        self,
+        config: Config,
+        input_devices: list[InputDevice],
+        output_devices: list[OutputDevice],
+        loopback_pin: Optional[int] = None,
+    ) -> None:
+        self.config = config
         self.input_devices = input_devices
         self.output_devices = output_devices
+        self.loopback_pin = loopback_pin  # input wired to an output line for latency calibration
+
+        # skew compensation: outputs with shorter trigger-to-effect latency get later deadlines
+        self.compensate: bool = self.config.skew_compensation_enable.value
+        self.latencies: dict[OutputDevice, float] = {}
+        self.delays: dict[OutputDevice, float] = {}
+        self.slowest_latency = 0.0
+        self.load_latencies()
+
+        # reading `enabled` goes to the config storage, so it is done on config changes, not on triggers
+        self.enabled_outputs: list[OutputDevice] = []
+        self._enable_keys = {o_device.enable_key for o_device in self.output_devices if o_device.enable_key}
+        self.update_enabled_outputs()
+
+        # synchronized fire: one absolute deadline per trigger shared by all outputs
+        self.sync_fire: bool = self.config.sync_fire_enable.value
+        self.shutter_lag: int = self.config.shutter_lag.value
+        self.last_skew: Optional[float] = None  # s between the first and the last output fired
+        self.last_lateness: Optional[float] = None  # s the last output fired after the deadline
 
+        # predictive mode: periodic subjects are shot at the next predicted event instead of reactively
+        self.predictive: bool = self.config.predict_enable.value
+        self.estimator = PeriodEstimator()
+        self.predicting = False
+
+        self.tracer = Tracer()
+        self.bus = EventBusDefaultDict()
+        self.bus.add_listener(ConfigChangeEvent, self.on_config_change)
+
+        # inputs go through the admission stage, which calls notify_callback for admitted edges
+        self.admission = AdmissionControl(self.config, self.notify_callback)
         for device in self.input_devices:
-            device.set_notify_callback(self.notify_callback)
+            device.set_notify_callback(self.admission.notify_callback)
+
+    def update_enabled_outputs(self) -> None:
+        self.enabled_outputs = [o_device for o_device in self.output_devices if o_device.enabled]
+        logger.info(f"Enabled outputs: {[o_device.__class__.__name__ for o_device in self.enabled_outputs]}")
+        self.update_delays()
+
+    def load_latencies(self) -> None:
+        self.latencies = {o_device: load_latency(self.config.storage, o_device) for o_device in self.output_devices}
+
+    def update_delays(self) -> None:
+        self.slowest_latency = max((self.latencies[o_device] for o_device in self.enabled_outputs), default=0.0)
+        if not self.compensate or len(self.enabled_outputs) < 2:
+            self.delays = {}
+            return
+
+        self.delays = {o_device: self.slowest_latency - self.latencies[o_device] for o_device in self.enabled_outputs}
+        delays = ", ".join(f"{o.__class__.__name__} {delay * 1000:.1f} ms" for o, delay in self.delays.items())
+        logger.info(f"Output delays: {delays}")
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key in self._enable_keys:
+            self.update_enabled_outputs()
+        elif event.key == "sync_fire_enable":
+            self.sync_fire = event.new_value
+        elif event.key == "shutter_lag":
+            self.shutter_lag = event.new_value
+        elif event.key == "predict_enable":
+            self.predictive = event.new_value
+            self.estimator.reset()
+        elif event.key == "skew_compensation_enable":
+            self.compensate = event.new_value
+            self.update_delays()
+        elif event.key == "latency_calibrate" and event.new_value:
+            await self.calibrate()
+
+    async def calibrate(self, shots: int = 10) -> None:
+        loopback = LoopbackProbe(self.loopback_pin) if self.loopback_pin is not None else None
+        try:
+            await calibrate(self.config.storage, self.enabled_outputs, loopback=loopback, shots=shots)
+        finally:
+            self.config.latency_calibrate.value = False
+
+        self.load_latencies()
+        self.update_delays()
 
     async def notify_callback(self, value: bool) -> None:
-        for o_device in self.output_devices:
-            if value:
-                asyncio.create_task(o_device.shutter())
-            else:
-                asyncio.create_task(o_device.release())
+        with self.tracer.span("Router.notify_callback", value=value):
+            await self.fire(value)
+
+    async def fire(self, value: bool) -> None:
+        outputs = self.enabled_outputs
+        if not outputs:
+            return
+
+        deadline = None
+        if value:
+            now = time.monotonic()
+            if self.predictive:
+                deadline = self.predict_deadline(now)
+            if deadline is None and self.sync_fire:
+                deadline = now + self.shutter_lag / 1000
+
+        deadlines = {}
+        if deadline is not None:
+            deadlines = {o_device: deadline + delay for o_device, delay in self.delays.items()}
+
+        # every output runs the phase in a task of its own, the router only waits for them
+        started: dict[asyncio.Task[None], OutputDevice] = {}
+        for o_device in outputs:
+            task = o_device.on_shutter_edge(deadlines.get(o_device, deadline)) if value else o_device.on_release_edge()
+            if task is not None:
+                started[task] = o_device
+        if started:
+            await asyncio.wait(started)
+
+        for task, o_device in started.items():
+            if not task.cancelled() and task.exception() is not None:
+                logger.exception(f"{o_device.__class__.__name__} failed", exc_info=task.exception())
+
+        if deadline is not None:
+            self.report_skew(outputs, deadline)
+
+    def predict_deadline(self, now: float) -> Optional[float]:
+        """Deadline for the next predicted event minus the output latency, None when the prediction is not confident."""
+
+        self.estimator.add(now)
+        prediction = self.estimator.predict(now)
+        if (prediction is not None) != self.predicting:
+            self.predicting = prediction is not None
+            logger.info(f"Router switched to {'predictive' if self.predicting else 'reactive'} triggering")
+        if prediction is None:
+            return None
+
+        event = prediction.next_after(now + self.slowest_latency + PREDICT_MARGIN)
+        self.tracer.instant("Router.predict", period_ms=prediction.period * 1000, ahead_ms=(event - now) * 1000)
+        return event - self.slowest_latency
+
+    def report_skew(self, outputs: list[OutputDevice], deadline: float) -> None:
+        # expected effect times: when each output fired plus its calibrated latency
+        fired = [
+            o_device.fired_at + self.latencies.get(o_device, 0.0)
+            for o_device in outputs
+            if o_device.fired_at and o_device.fired_at >= deadline
+        ]
+        if len(fired) < 2:
+            return
+
+        self.last_skew = max(fired) - min(fired)
+        self.last_lateness = max(fired) - deadline
+        logger.info(f"Sync fire: skew {self.last_skew * 1000:.3f} ms, lateness {self.last_lateness * 1000:.3f} ms")
 
     def set_shutter_lag(self, lag: int) -> None:
         for o_device in self.output_devices:
@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+from collections import deque
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any, NamedTuple, Optional
+
+from libs.eventbus import EventBusDefaultDict
+from libs.eventtypes import ConfigChangeEvent
+from libs.utils import Singleton
+
+logger = logging.getLogger(__name__)
+
+# set where an edge enters the app, copied into every task (and run_coroutine_threadsafe call) it spawns
+trace_id: ContextVar[Optional[int]] = ContextVar("trace_id", default=None)
+# monotonic time of that edge, set along with the trace id even when tracing is off
+edge_at: ContextVar[Optional[float]] = ContextVar("edge_at", default=None)
+
+
+class Span(NamedTuple):
+    name: str
+    trace: Optional[int]
+    start_ns: int  # time.monotonic_ns()
+    end_ns: int
+    track: str  # thread name, or task name for spans in the event loop, overlapping tasks get their own rows
+    args: Optional[dict[str, Any]]
+
+
+class Tracer(metaclass=Singleton):
+    """Bounded in-memory buffer of timed spans, grouped per trigger by `trace_id`.
+
+    Recording is a no-op unless `enabled`, the `trace_enable` setting switches it at runtime.
+    `export` writes Chrome trace-event JSON, which opens in Perfetto or chrome://tracing.
+    """
+
+    def __init__(self, enabled: bool = False, size: int = 20000) -> None:
+        self.enabled = enabled
+        self.spans: deque[Span] = deque(maxlen=size)
+        self._ids = itertools.count(1)
+
+        self.bus = EventBusDefaultDict()
+        self.bus.add_listener(ConfigChangeEvent, self.on_config_change)
+
+    async def on_config_change(self, event: ConfigChangeEvent) -> None:
+        if event.key == "trace_enable":
+            self.enabled = event.new_value
+
+    def start_trace(self, at: Optional[float] = None) -> Optional[int]:
+        """Gives the current context (thread or task) a new trace id, for an edge seen `at` (now by default)."""
+
+        edge_at.set(time.monotonic() if at is None else at)
+        if not self.enabled:
+            return None
+
+        new_id = next(self._ids)
+        trace_id.set(new_id)
+        return new_id
+
+    def ensure_trace(self) -> Optional[int]:
+        if edge_at.get() is None:
+            return self.start_trace()
+        return trace_id.get()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start_ns, time.monotonic_ns(), args or None)
+
+    def instant(self, name: str, **args: Any) -> None:
+        if self.enabled:
+            now = time.monotonic_ns()
+            self.record(name, now, now, args or None)
+
+    def record(self, name: str, start_ns: int, end_ns: int, args: Optional[dict[str, Any]] = None) -> None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        track = task.get_name() if task is not None else threading.current_thread().name
+        self.spans.append(Span(name, trace_id.get(), start_ns, end_ns, track, args))
+
+    def to_chrome(self) -> dict[str, Any]:
+        pid = os.getpid()
+        spans = list(self.spans)
+        tracks = {track: tid for tid, track in enumerate(dict.fromkeys(span.track for span in spans), start=1)}
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}}
+            for track, tid in tracks.items()
+        ]
+        for span in spans:
+            event: dict[str, Any] = {
+                "name": span.name,
+                "cat": "trigger",
+                "pid": pid,
+                "tid": tracks[span.track],
+                "ts": span.start_ns / 1000,
+                "args": {"trace": span.trace, **(span.args or {})},
+            }
+            if span.end_ns > span.start_ns:
+                event.update(ph="X", dur=(span.end_ns - span.start_ns) / 1000)
+            else:
+                event.update(ph="i", s="t")
+            events.append(event)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Optional[str] = None) -> str:
+        path = path or f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f)
+        logger.info(f"Exported {len(self.spans)} spans to {path}")
+        return path
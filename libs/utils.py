@@ -1,5 +1,8 @@
 import asyncio
+import statistics
+import time
 
+from collections.abc import Iterable
 from enum import Enum
 from threading import Timer
 from typing import Any, Callable, Optional, Union
@@ -108,5 +111,71 @@ class TaskTimer:
         return f"TaskTimer(interval={self.interval}, callback={self.callback})"
 
 
+SPIN_WINDOW = 0.002  # s, the event loop wakes up this early and spins the rest
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def sleep_until(deadline: float, spin: float = SPIN_WINDOW) -> None:
+    """
+    Sleeps until an absolute deadline.
+
+    The loop wakes up through `loop.call_at` `spin` seconds before the deadline and busy-waits
+    the remainder, which takes the timer and scheduling jitter of `asyncio.sleep` out of the
+    result at the cost of holding the loop for at most `spin` seconds.
+
+    Args:
+        deadline (float): The time to wake up at, in `time.monotonic()` seconds (the loop clock).
+        spin (float): How long before the deadline to stop sleeping and start spinning.
+
+    Returns:
+        None.
+    """
+
+    loop = asyncio.get_running_loop()
+    if deadline - spin > loop.time():
+        future = loop.create_future()
+        handle = loop.call_at(deadline - spin, _wake, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    while time.monotonic() < deadline:
+        pass
+
+
+def summarize(values: Iterable[float], scale: float = 1.0) -> dict[str, float]:
+    """
+    Summarizes a sample of latencies or errors.
+
+    Args:
+        values (Iterable[float]): The sample, in any order.
+        scale (float): Factor applied to the results, e.g. 1000 for seconds to milliseconds.
+
+    Returns:
+        dict[str, float]: count, min, p50 (the median), p99, max and mean, empty for an empty sample.
+
+    Raises:
+        None.
+    """
+
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+
+    return {
+        "count": len(ordered),
+        "min": ordered[0] * scale,
+        "p50": statistics.median(ordered) * scale,
+        "p99": ordered[min(len(ordered) * 99 // 100, len(ordered) - 1)] * scale,
+        "max": ordered[-1] * scale,
+        "mean": statistics.fmean(ordered) * scale,
+    }
+
+
 def split_list(lst: list[Any], n: int) -> list[list[Any]]:
     return [lst[i : i + n] for i in range(0, len(lst), n)]
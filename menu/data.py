@@ -2,7 +2,8 @@ import logging
 
 from typing import Optional
 
-from libs.config import Config, ConfigItem, ParamType
+from libs.config import Config as Config  # re-exported, devices import it from here
+from libs.config import ConfigItem, ParamType
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +59,36 @@ def create_menu_tree(config: Config) -> MenuItem:
     trigger_folder.append_child(MenuItem(config_item=config.digital_trigger_enable))
     trigger_folder.append_child(MenuItem(config_item=config.digital_trigger_direction))
     trigger_folder.append_child(MenuItem(config_item=config.digital_emmitter_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.audio_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.audio_trigger_threshold))
+    trigger_folder.append_child(MenuItem(config_item=config.audio_block_size))
+    trigger_folder.append_child(MenuItem(config_item=config.motion_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.motion_threshold))
+    trigger_folder.append_child(MenuItem(config_item=config.motion_area))
+    trigger_folder.append_child(MenuItem(config_item=config.vibration_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.vibration_threshold))
+    trigger_folder.append_child(MenuItem(config_item=config.distance_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.distance_near))
+    trigger_folder.append_child(MenuItem(config_item=config.distance_far))
+    trigger_folder.append_child(MenuItem(config_item=config.udp_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.udp_port))
+    trigger_folder.append_child(MenuItem(config_item=config.camera_trigger_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.intervalometer_enable))
+    trigger_folder.append_child(MenuItem(config_item=config.intervalometer_interval))
+    trigger_folder.append_child(MenuItem(config_item=config.intervalometer_frames))
     trigger_folder.append_child(MenuItem(ParamType.EXIT, "Exit", "arrow-turn-down-left"))
 
     emitter_folder = MenuItem(ParamType.FOLDER, "Emitter", icon="arrow-right-from-bracket")
     emitter_folder.append_child(MenuItem(config_item=config.optron_enable))
+    emitter_folder.append_child(MenuItem(config_item=config.optron_prefocus))
+    emitter_folder.append_child(MenuItem(config_item=config.optron_focus_time))
     emitter_folder.append_child(MenuItem(config_item=config.oled_blink_enable))
     emitter_folder.append_child(MenuItem(config_item=config.led_timer_enable))
+    emitter_folder.append_child(MenuItem(config_item=config.oled_timer_fps))
     emitter_folder.append_child(MenuItem(config_item=config.led_blink_enable))
+    emitter_folder.append_child(MenuItem(config_item=config.pin_precise_enable))
+    emitter_folder.append_child(MenuItem(config_item=config.sequencer_enable))
+    emitter_folder.append_child(MenuItem(config_item=config.sequencer_preset))
     emitter_folder.append_child(MenuItem(config_item=config.console_enable))
     emitter_folder.append_child(MenuItem(config_item=config.gphoto_enable))
     emitter_folder.append_child(MenuItem(ParamType.EXIT, "Exit", "arrow-turn-down-left"))
@@ -73,6 +97,17 @@ def create_menu_tree(config: Config) -> MenuItem:
     timer_folder.append_child(MenuItem(config_item=config.shutter_lag))
     timer_folder.append_child(MenuItem(config_item=config.release_lag))
     timer_folder.append_child(MenuItem(config_item=config.trigger_read_timer))
+    timer_folder.append_child(MenuItem(config_item=config.sync_fire_enable))
+    timer_folder.append_child(MenuItem(config_item=config.skew_compensation_enable))
+    timer_folder.append_child(MenuItem(config_item=config.predict_enable))
+    timer_folder.append_child(MenuItem(config_item=config.latency_calibrate))
+    timer_folder.append_child(MenuItem(config_item=config.retrigger_policy))
+    timer_folder.append_child(MenuItem(config_item=config.admission_enable))
+    timer_folder.append_child(MenuItem(config_item=config.admission_rate))
+    timer_folder.append_child(MenuItem(config_item=config.admission_burst))
+    timer_folder.append_child(MenuItem(config_item=config.admission_interval))
+    timer_folder.append_child(MenuItem(config_item=config.admission_defer))
+    timer_folder.append_child(MenuItem(config_item=config.admission_max_delay))
     timer_folder.append_child(MenuItem(ParamType.EXIT, "Exit", "arrow-turn-down-left"))
 
     macro_folder = MenuItem(ParamType.FOLDER, "Macro", icon="flower-tulip")
@@ -90,12 +125,15 @@ def create_menu_tree(config: Config) -> MenuItem:
     settings_folder = MenuItem(ParamType.FOLDER, "Settings", icon="screwdriver-wrench")
     settings_folder.append_child(MenuItem(config_item=config.night_mode))
     settings_folder.append_child(MenuItem(config_item=config.hwinfo_enable))
+    settings_folder.append_child(MenuItem(config_item=config.trace_enable))
     settings_folder.append_child(MenuItem(ParamType.EXIT, "Exit", "arrow-turn-down-left"))
 
     bluetooth_folder = MenuItem(ParamType.FOLDER, "Bluetooth", icon="bluetooth")
     bluetooth_folder.append_child(MenuItem(config_item=config.bt_enable))
     bluetooth_folder.append_child(MenuItem(config_item=config.bt_bulb))
     bluetooth_folder.append_child(MenuItem(config_item=config.bt_af_enable))
+    bluetooth_folder.append_child(MenuItem(config_item=config.bt_armed))
+    bluetooth_folder.append_child(MenuItem(config_item=config.bt_burst))
     bluetooth_folder.append_child(MenuItem(ParamType.EXIT, "Exit", "arrow-turn-down-left"))
 
     root.append_children(
@@ -5,7 +5,7 @@ from typing import Any, Union
 
 from luma.core.render import canvas
 from luma.oled.device import device as LumaDevice
-from PIL import ImageFont
+from PIL import Image, ImageFont
 
 from libs.eventbus import EventBusDefaultDict
 from libs.eventtypes import ConfigChangeEvent, HWInfoUpdateEvent, MenuClickEvent, MenuHoldEvent, MenuRotateEvent
@@ -21,6 +21,23 @@ logger = logging.getLogger(__name__)
 FONTS = {x: ImageFont.truetype("fonts/better-vcr-5.2.ttf", x) for x in range(4, 33, 2)}
 
 
+def display_region(screen: LumaDevice, image: Image.Image, x0: int, x1: int, page0: int, page1: int) -> None:
+    """Pushes only columns `x0` to `x1` of pages `page0` to `page1` (8 rows each, ends exclusive) of a
+    full-size SH1106 frame, instead of the whole 1 KiB `display` sends."""
+
+    if screen.rotate or not hasattr(screen, "_page_address_offset"):
+        screen.display(image)
+        return
+
+    column = x0 + screen._page_address_offset
+    for page in range(page0, page1):
+        # one byte per column, top row in the lowest bit
+        strip = image.crop((x0, page * 8, x1, page * 8 + 8))
+        strip = strip.transpose(Image.Transpose.TRANSPOSE).transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        screen.command(0xB0 + page, column & 0x0F, 0x10 | column >> 4)
+        screen.data(list(strip.tobytes()))
+
+
 class OledMenu:
     _current_menu_position = [0, 0, 0]
     _edit_precision = 0
@@ -161,7 +178,11 @@ class OledMenu:
 
             icon_items_rows = split_list(icon_items, 3)
 
-            for row_id, row in enumerate(icon_items_rows):
+            # only two rows fit below the title, scroll so the current item stays visible
+            current_row = next((i for i, row in enumerate(icon_items_rows) if current_item in row), 0)
+            first_row = max(current_row - 1, 0)
+
+            for row_id, row in enumerate(icon_items_rows[first_row : first_row + 2]):
                 for item_id, item in enumerate(row):
                     text, font = fa(item.get_icon(), 16)
                     draw.text((item_id * 24 + padding_x + 6, 16 + 4 + 24 * row_id), text, fill="white", font=font)
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import time
+
+from libs.pulse import PulseEngine, PulseStats, calibrate_spin
+
+
+def print_summary(title: str, stats: PulseStats) -> None:
+    summary = stats.summary()
+    print(
+        f"{title:14} min {summary['min'] * 1e6:+8.1f} us  p50 {summary['p50'] * 1e6:+8.1f} us"
+        f"  p99 {summary['p99'] * 1e6:+8.1f} us  max {summary['max'] * 1e6:+8.1f} us"
+    )
+
+
+async def bench_asyncio(count: int, width: float, interval: float) -> PulseStats:
+    stats = PulseStats(size=count * 2)
+    for _ in range(count):
+        await asyncio.sleep(interval)
+        started_at = time.monotonic()
+        await asyncio.sleep(width)
+        stats.add(time.monotonic() - started_at - width)
+    return stats
+
+
+async def bench_engine(engine: PulseEngine, count: int, width: float, interval: float) -> PulseStats:
+    start = time.monotonic() + interval
+    for i in range(count):
+        on = start + i * (interval + width)
+        await asyncio.gather(engine.edge(on, lambda: None), engine.edge(on + width, lambda: None))
+    return engine.stats
+
+
+def main(args: argparse.Namespace) -> None:
+    width = args.width / 1000
+    interval = args.interval / 1000
+    spin = args.spin / 1000 if args.spin is not None else calibrate_spin()
+    print(f"{args.count} pulses of {args.width} ms every {args.interval} ms, spin window {spin * 1000:.3f} ms")
+
+    print_summary("asyncio.sleep", asyncio.run(bench_asyncio(args.count, width, interval)))
+
+    engine = PulseEngine(spin=spin)
+    stats = asyncio.run(bench_engine(engine, args.count, width, interval))
+    engine.stop()
+    print_summary("PulseEngine", stats)
+    print(f"{'':14} late wakeups {stats.late_wakeups}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pulse timing error: asyncio.sleep vs PulseEngine")
+
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--width", type=float, default=5, help="pulse width, ms")
+    parser.add_argument("--interval", type=float, default=10, help="ms between pulses")
+    parser.add_argument("--spin", type=float, default=None, help="spin window, ms (calibrated when omitted)")
+
+    args = parser.parse_args()
+
+    main(args)
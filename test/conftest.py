@@ -0,0 +1,89 @@
+"""Stand-ins for the Raspberry Pi only modules, so the tests also run off the Pi."""
+
+import sys
+import types
+
+from typing import Any, Callable, Optional
+
+import pytest
+
+
+def _fake_gpio() -> types.ModuleType:
+    state: dict[int, int] = {}
+    callbacks: dict[int, Callable[[int], None]] = {}
+
+    def setup(channel: Any, direction: int, initial: int = 0, pull_up_down: Optional[int] = None) -> None:
+        for pin in channel if isinstance(channel, (list, tuple)) else [channel]:
+            state.setdefault(pin, initial)
+
+    def output(channel: int, value: int) -> None:
+        state[channel] = value
+
+    def add_event_detect(channel: int, edge: int, callback: Any = None, bouncetime: Optional[int] = None) -> None:
+        callbacks[channel] = callback
+
+    gpio = types.ModuleType("RPi.GPIO")
+    gpio.__dict__.update(
+        OUT=0, IN=1, LOW=0, HIGH=1, BOARD=10, BCM=11, PUD_OFF=20, PUD_DOWN=21, PUD_UP=22, RISING=31, FALLING=32, BOTH=33
+    )
+    gpio.__dict__.update(
+        state=state,
+        callbacks=callbacks,
+        setmode=lambda mode: None,
+        setwarnings=lambda flag: None,
+        setup=setup,
+        output=output,
+        input=lambda channel: state.get(channel, 0),
+        cleanup=lambda channel=None: None,
+        add_event_detect=add_event_detect,
+        add_event_callback=add_event_detect,
+        remove_event_detect=lambda channel: callbacks.pop(channel, None),
+    )
+    return gpio
+
+
+def _install_fakes() -> None:
+    try:
+        import RPi.GPIO  # noqa: F401
+    except (ImportError, RuntimeError):
+        rpi = types.ModuleType("RPi")
+        gpio = _fake_gpio()
+        rpi.__dict__["GPIO"] = gpio
+        sys.modules["RPi"], sys.modules["RPi.GPIO"] = rpi, gpio
+
+    try:
+        import smbus  # noqa: F401
+    except ImportError:
+        fake_smbus = types.ModuleType("smbus")
+
+        class SMBus:
+            def __init__(self, bus: int) -> None:
+                raise OSError(f"no I2C bus {bus} off the Pi")
+
+        fake_smbus.__dict__["SMBus"] = SMBus
+        sys.modules["smbus"] = fake_smbus
+
+    try:
+        import gphoto2  # noqa: F401
+    except ImportError:
+        fake_gphoto2 = types.ModuleType("gphoto2")
+
+        class GPhoto2Error(Exception):
+            pass
+
+        fake_gphoto2.__dict__.update(GPhoto2Error=GPhoto2Error, GP_ERROR_MODEL_NOT_FOUND=-105, Camera=object)
+        sys.modules["gphoto2"] = fake_gphoto2
+
+
+_install_fakes()
+
+STORAGE: dict[str, str] = {}
+
+
+@pytest.fixture
+def config() -> Any:
+    from menu.data import Config
+
+    STORAGE.clear()
+    # Config is a singleton, every test shares it and gets a clean storage
+    return Config(STORAGE)
@@ -0,0 +1,88 @@
+import struct
+
+from collections import deque
+from typing import Any
+
+import RPi.GPIO as GPIO
+
+from libs.device.accelerometer import (
+    ADXL345_DEVID,
+    DATAX0,
+    DEVID,
+    ENTRY_SIZE,
+    FIFO_STATUS,
+    AccelerometerInputDevice,
+)
+
+INT_PIN = 17
+REST = (0, 0, 256)  # 1 g on z
+KNOCK = (0, 0, 512)  # 2 g
+
+
+class FakeADXL345:
+    """SMBus with an ADXL345 behind it, `arrivals` are the entries that come in after each FIFO_STATUS read."""
+
+    def __init__(self) -> None:
+        self.fifo: deque[tuple[int, int, int]] = deque()
+        self.arrivals: deque[int] = deque()
+        self.registers: dict[int, int] = {}
+
+    def push(self, count: int, entry: tuple[int, int, int] = REST) -> None:
+        self.fifo.extend([entry] * count)
+
+    def read_byte_data(self, address: int, register: int) -> int:
+        if register == DEVID:
+            return ADXL345_DEVID
+        if register == FIFO_STATUS:
+            entries = len(self.fifo)
+            if self.arrivals:
+                self.push(self.arrivals.popleft())
+            return min(entries, 32)
+        return self.registers.get(register, 0)
+
+    def write_byte_data(self, address: int, register: int, value: int) -> None:
+        self.registers[register] = value
+
+    def read_i2c_block_data(self, address: int, register: int, length: int) -> list[int]:
+        assert (register, length) == (DATAX0, ENTRY_SIZE)
+        return list(struct.pack("<3h", *self.fifo.popleft()))
+
+
+def batch(*entries: tuple[int, int, int]) -> bytes:
+    return b"".join(struct.pack("<3h", *entry) for entry in entries)
+
+
+def test_interrupt_drains_the_fifo_below_the_watermark(config: Any) -> None:
+    bus = FakeADXL345()
+    bus.push(20)
+    bus.arrivals.extend([17, 3])  # samples coming in while the earlier ones are read
+    device = AccelerometerInputDevice(config, bus=bus, int_pin=INT_PIN, watermark=16)
+
+    device.enable()  # reads what is queued already, INT1 would not rise for it
+
+    assert device.samples_read == 40
+    assert len(bus.fifo) < device.watermark
+    device.disable()
+
+
+def test_threshold_and_release(config: Any) -> None:
+    device = AccelerometerInputDevice(config, bus=FakeADXL345())  # vibration_threshold 300 mg
+
+    device.process(batch(REST, (0, 0, 300)), 1.0)
+    assert not device._active
+
+    device.process(batch(REST, KNOCK, REST), 2.0)
+    assert device._active
+    assert device.last_trigger == 2.0
+
+    device.process(batch(REST, REST), 3.0)
+    assert not device._active
+
+
+def test_failed_setup_leaves_the_pins_alone(config: Any) -> None:
+    device = AccelerometerInputDevice(config, int_pin=INT_PIN)  # no I2C bus off the Pi
+
+    device.enable()
+    device.disable()
+
+    assert INT_PIN not in GPIO.callbacks
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from libs.device.beam import LockInDetector, demodulate
+
+
+@pytest.mark.parametrize("inverted", [False, True])
+def test_demodulate_and_detector_agree(inverted: bool) -> None:
+    emitter = np.array([True, False] * 16)
+    lit, dark = (0.0, 1.0) if inverted else (1.0, 0.0)
+    samples = np.where(emitter, lit, dark)
+    samples[20:] = dark  # beam broken from period 10 on
+
+    detector = LockInDetector(window=4, inverted=inverted)
+    online = []
+    for i in range(0, len(samples), 2):
+        detector.update(samples[i], samples[i + 1])
+        online.append(detector.contrast)
+
+    assert np.allclose(demodulate(samples, emitter, 4, inverted=inverted), online)
+    assert online[9] == 1.0
+    assert online[-1] == 0.0
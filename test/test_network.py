@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+from typing import Any
+
+from libs.config import ParamType
+from libs.device.network import SEQUENCE_MOD, SHUTTER, SequenceWindow, UdpInputDevice, pack_trigger
+from libs.eventtypes import ConfigChangeEvent
+
+
+def test_window_drops_repeats_and_stale_numbers() -> None:
+    window = SequenceWindow(size=8)
+
+    assert [window.accept(sequence) for sequence in (1, 3, 3, 2, 1, 20, 12, 11)] == [
+        True,
+        True,
+        False,
+        True,
+        False,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_window_follows_the_sequence_through_the_wrap() -> None:
+    window = SequenceWindow(size=8)
+    last = SEQUENCE_MOD - 1
+
+    assert window.accept(last - 1)
+    assert window.accept(last)
+    assert window.accept(0)
+    assert window.accept(1)
+    assert not window.accept(last)  # a repeat from before the wrap
+    assert not window.accept(SEQUENCE_MOD // 2 + 1)  # more than half the range ahead is old
+
+
+def test_sessions_are_bounded(config: Any) -> None:
+    async def run() -> UdpInputDevice:
+        device = UdpInputDevice(config, sessions=4)
+        for session in range(10):
+            device.on_packet(pack_trigger(SHUTTER, session, 0), ("10.0.0.2", 5005), 0)
+        device.on_packet(pack_trigger(SHUTTER, 9, 0), ("10.0.0.2", 5005), 0)
+        return device
+
+    device = asyncio.run(run())
+
+    assert list(device._windows) == [("10.0.0.2", session) for session in (6, 7, 8, 9)]
+    assert device.stats.duplicates == 1
+
+
+def test_bad_port_is_logged(config: Any, caplog: Any) -> None:
+    config.storage["udp_trigger_enable"] = "1"
+    config.storage["udp_port"] = "70000"
+
+    async def run() -> UdpInputDevice:
+        device = UdpInputDevice(config)
+        await device.start()
+        return device
+
+    with caplog.at_level(logging.ERROR):
+        device = asyncio.run(run())
+
+    assert device.transport is None
+    assert "cannot listen" in caplog.text
+
+
+def test_port_changes_rebind_once(config: Any) -> None:
+    config.storage["udp_trigger_enable"] = "1"
+    starts = []
+
+    async def run() -> None:
+        device = UdpInputDevice(config)
+        device.REBIND_DELAY = 0.01
+
+        async def start() -> None:
+            starts.append(device.port)
+
+        device.start = start  # type: ignore[method-assign]
+        for port in (5006, 5007, 5008):
+            config.storage["udp_port"] = str(port)
+            await device.on_config_change(ConfigChangeEvent(key="udp_port", param_type=ParamType.INT, new_value=port))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert starts == [5008]
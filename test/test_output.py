@@ -0,0 +1,109 @@
+import asyncio
+
+from typing import Any, Optional
+
+import pytest
+
+from libs.device.output import OutputDevice, OutputPhase, RetriggerPolicy
+
+SHUTTER_TIME = 0.02
+RELEASE_TIME = 0.02
+
+
+class StubOutputDevice(OutputDevice):
+    def __init__(self, config: Any, retrigger: Optional[RetriggerPolicy] = None) -> None:
+        super().__init__(config)
+        self.retrigger = retrigger
+        self.log: list[str] = []
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        self.log.append("shutter")
+        try:
+            await asyncio.sleep(SHUTTER_TIME)
+        except asyncio.CancelledError:
+            self.log.append("shutter cancelled")
+            raise
+        self.mark_fired()
+
+    async def do_release(self) -> None:
+        self.log.append("release")
+        try:
+            await asyncio.sleep(RELEASE_TIME)
+        except asyncio.CancelledError:
+            self.log.append("release cancelled")
+            raise
+        self.log.append("released")
+
+
+async def edges(device: OutputDevice, *timeline: tuple[float, bool]) -> None:
+    """Sends trigger edges at the given offsets (s) and waits until every phase they started is over."""
+
+    async def edge(at: float, value: bool) -> None:
+        await asyncio.sleep(at)
+        await device.trigger(value)
+
+    await asyncio.gather(*[edge(at, value) for at, value in timeline])
+    await device._idle.wait()
+
+
+def test_release_starts_right_after_the_shutter(config: Any) -> None:
+    device = StubOutputDevice(config)
+
+    # the release edge comes while the shutter is still going
+    asyncio.run(edges(device, (0, True), (0.001, False)))
+
+    assert device.log == ["shutter", "release", "released"]
+    assert device.fired_at is not None
+    assert device.release_started_at is not None
+    assert device.release_started_at - device.fired_at < 0.001
+
+
+def test_release_is_skipped_when_nothing_fired(config: Any) -> None:
+    device = StubOutputDevice(config)
+    device.do_shutter = lambda deadline=None: asyncio.sleep(0)  # type: ignore[method-assign]
+
+    asyncio.run(edges(device, (0, True), (0.001, False)))
+
+    assert device.log == []
+    assert device.phase is OutputPhase.IDLE
+
+
+@pytest.mark.parametrize(
+    ("policy", "log", "ignored"),
+    [
+        (RetriggerPolicy.IGNORE, ["shutter", "release", "released"], 2),
+        (RetriggerPolicy.RESTART, ["shutter", "shutter cancelled", "shutter", "release", "released"], 1),
+        (RetriggerPolicy.QUEUE, ["shutter", "release", "released", "shutter", "release", "released"], 0),
+    ],
+)
+def test_shutter_edge_while_shutting(config: Any, policy: RetriggerPolicy, log: list[str], ignored: int) -> None:
+    device = StubOutputDevice(config, retrigger=policy)
+
+    # two presses, the second while the first shutter is running, then two releases
+    asyncio.run(edges(device, (0, True), (0.005, True), (0.010, False), (0.015, False)))
+
+    assert device.log == log
+    assert device.ignored == ignored
+    assert device.phase is OutputPhase.IDLE
+
+
+def test_extend_keeps_the_output_engaged(config: Any) -> None:
+    device = StubOutputDevice(config, retrigger=RetriggerPolicy.EXTEND)
+
+    async def run() -> OutputPhase:
+        shot = asyncio.create_task(device.trigger(True))
+        release = asyncio.create_task(device.trigger(False))
+        while device.phase is not OutputPhase.RELEASE:
+            await asyncio.sleep(0.001)
+
+        # the second press comes during the release lag of the first
+        await device.trigger(True)
+        await release
+        phase = device.phase
+        await device.trigger(False)
+        await shot
+        return phase
+
+    assert asyncio.run(run()) is OutputPhase.ACTIVE
+    assert device.log == ["shutter", "release", "release cancelled", "release", "released"]
+    assert device.phase is OutputPhase.IDLE
@@ -0,0 +1,49 @@
+from typing import Any
+
+from libs.predict import PeriodEstimator
+from libs.router import Router
+
+PERIOD = 0.1
+
+
+def feed(estimator: PeriodEstimator, times: list[float]) -> list[Any]:
+    # the order Router.predict_deadline uses: the new edge first, then the prediction
+    predictions = []
+    for timestamp in times:
+        estimator.add(timestamp)
+        predictions.append(estimator.predict(timestamp))
+    return predictions
+
+
+def test_predicts_periodic_events() -> None:
+    estimator = PeriodEstimator()
+    prediction = feed(estimator, [i * PERIOD for i in range(20)])[-1]
+
+    assert prediction is not None
+    assert abs(prediction.period - PERIOD) < 1e-9
+    assert abs(prediction.next_after(1.905) - 2.0) < 1e-9
+
+
+def test_pause_and_phase_shift_fall_back_to_reactive() -> None:
+    estimator = PeriodEstimator()
+    feed(estimator, [i * PERIOD for i in range(31)])  # up to 3.0 s
+
+    # 3 s pause, then the subject comes back 110 ms off the old grid
+    shifted = [6.11 + i * PERIOD for i in range(estimator.min_events)]
+    predictions = feed(estimator, shifted)
+
+    assert predictions[: estimator.min_events - 1] == [None] * (estimator.min_events - 1)
+    prediction = predictions[-1]
+    assert prediction is not None
+    assert abs(prediction.next_after(shifted[-1] + 0.01) - (shifted[-1] + PERIOD)) < 1e-6
+
+
+def test_router_does_not_schedule_on_a_stale_grid(config: Any) -> None:
+    config.storage["predict_enable"] = "1"
+    router = Router(config, [], [])
+
+    deadlines = [router.predict_deadline(i * PERIOD) for i in range(31)]
+    assert deadlines[-1] is not None
+
+    assert router.predict_deadline(6.11) is None
+    assert not router.predicting
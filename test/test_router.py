@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import tracemalloc
+
+from typing import Any, Optional
+
+import pytest
+
+from libs.device.output import ConsoleOutputDevice, OptronOutputDevice, OutputDevice, PinOutputDevice
+from libs.router import Router
+
+TRIGGER_BUDGET = 32 * 1024  # bytes of traced allocations a burst of triggers may peak at
+
+
+class FailingOutputDevice(OutputDevice):
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    async def do_shutter(self, deadline: Optional[float] = None) -> None:
+        raise OSError("camera unplugged")
+
+
+def realistic_outputs(config: Any) -> list[OutputDevice]:
+    for key in ("led_blink_enable", "optron_enable"):
+        config.storage[key] = "1"
+    config.storage["release_lag"] = "0"
+    config.storage["optron_focus_time"] = "0"
+    return [ConsoleOutputDevice(config), PinOutputDevice(config, pin=12), OptronOutputDevice(config, 14, 15)]
+
+
+def test_trigger_allocation_budget(config: Any) -> None:
+    async def run() -> int:
+        router = Router(config, [], realistic_outputs(config))
+        assert len(router.enabled_outputs) == 3
+
+        for _ in range(3):  # first calls fill caches
+            await router.notify_callback(True)
+            await router.notify_callback(False)
+
+        tracemalloc.start()
+        try:
+            for _ in range(100):
+                await router.notify_callback(True)
+                await router.notify_callback(False)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert asyncio.run(run()) < TRIGGER_BUDGET
+
+
+@pytest.mark.parametrize("others", [0, 1])
+def test_failing_output_is_logged(config: Any, caplog: Any, others: int) -> None:
+    outputs: list[OutputDevice] = [FailingOutputDevice(config)] + [ConsoleOutputDevice(config)] * others
+    router = Router(config, [], outputs)
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(router.fire(True))
+
+    assert "FailingOutputDevice failed" in caplog.text
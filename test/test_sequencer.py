@@ -0,0 +1,42 @@
+import os
+
+from typing import Any
+
+import pytest
+
+from libs.device.sequencer import (
+    EXAMPLE_TIMELINE,
+    SequencerOutputDevice,
+    compile_timeline,
+    load_timeline,
+    save_timeline,
+)
+from libs.pins import BUTTON_LEFT, OLED
+
+
+def test_example_compiles() -> None:
+    assert compile_timeline(EXAMPLE_TIMELINE)[0] == (0.0, 12, True)
+
+
+@pytest.mark.parametrize("pin", [BUTTON_LEFT, OLED[4], 40])
+def test_rejects_pins_it_does_not_own(pin: int, tmp_path: Any) -> None:
+    timeline = {"channels": {"valve": pin}, "pulses": [["valve", 0, 10]]}
+    with pytest.raises(ValueError, match=f"Pin {pin} "):
+        compile_timeline(timeline)
+    with pytest.raises(ValueError, match=f"Pin {pin} "):
+        save_timeline(str(tmp_path / "timelines.json"), 1, timeline)
+
+
+def test_device_picks_up_edited_presets(config: Any, tmp_path: Any) -> None:
+    path = str(tmp_path / "timelines.json")
+    save_timeline(path, 1, EXAMPLE_TIMELINE)
+    device = SequencerOutputDevice(config, path=path)
+    device.load()
+    assert len(device.edges) == 6
+
+    # an edit from timeline.py while the app runs
+    save_timeline(path, 1, {"pulses": [[12, 0, 5]]})
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    device.load()
+    assert device.edges == [(0.0, 12, True), (0.005, 12, False)]
+    assert load_timeline(path, 2) is None
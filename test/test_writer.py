@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from libs.ble.utils import SFD
+from libs.ble.writer import CommandWriter
+
+FOCUS_NEAR = b"\x02\x6b\x10"
+FOCUS_NEARER = b"\x02\x6b\x20"
+
+
+class GatedWrites:
+    """Write callback that holds every write until `gate` is set."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.written: list[bytes] = []
+
+    async def __call__(self, command: bytes, response: bool) -> None:
+        await self.gate.wait()
+        self.written.append(command)
+
+
+def test_coalesced_sender_outlives_the_cancelled_one() -> None:
+    async def run() -> list[bytes]:
+        writes = GatedWrites()
+        writer = CommandWriter(writes)
+        busy = asyncio.create_task(writer.send(SFD))
+        await asyncio.sleep(0)
+        first = asyncio.create_task(writer.send(FOCUS_NEAR))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(writer.send(FOCUS_NEARER))  # replaces the queued FOCUS_NEAR
+        await asyncio.sleep(0)
+
+        first.cancel()
+        writes.gate.set()
+        await asyncio.wait_for(asyncio.gather(busy, second), 1)
+        assert first.cancelled()
+        assert writer.coalesced == 1
+        writer.stop()
+        return writes.written
+
+    assert asyncio.run(run()) == [SFD, FOCUS_NEARER]
+
+
+def test_commands_are_dropped_when_every_sender_is_cancelled() -> None:
+    async def run() -> list[bytes]:
+        writes = GatedWrites()
+        writer = CommandWriter(writes)
+        busy = asyncio.create_task(writer.send(SFD))
+        await asyncio.sleep(0)
+        senders = [asyncio.create_task(writer.send(command)) for command in (FOCUS_NEAR, FOCUS_NEARER)]
+        await asyncio.sleep(0)
+
+        for sender in senders:
+            sender.cancel()
+        writes.gate.set()
+        await busy
+        await asyncio.sleep(0.01)
+        writer.stop()
+        return writes.written
+
+    assert asyncio.run(run()) == [SFD]
+
+
+def test_stop_fails_waiting_senders() -> None:
+    async def run() -> None:
+        writer = CommandWriter(GatedWrites())
+        senders = [asyncio.create_task(writer.send(command)) for command in (SFD, FOCUS_NEAR)]
+        await asyncio.sleep(0)
+
+        writer.stop()
+        for sender in senders:
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(sender, 1)
+
+    asyncio.run(run())
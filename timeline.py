@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from libs.device.sequencer import (
+    EXAMPLE_TIMELINE,
+    TIMELINES_PATH,
+    compile_timeline,
+    delete_timeline,
+    load_timeline,
+    load_timelines,
+    save_timeline,
+)
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.command == "list":
+        for slot, timeline in sorted(load_timelines(args.path).items()):
+            print(slot, json.dumps(timeline))
+    elif args.command == "show":
+        timeline = load_timeline(args.path, args.slot)
+        if timeline is None:
+            print(f"timeline {args.slot} is empty")
+            return
+        for offset, pin, level in compile_timeline(timeline):
+            print(f"{offset * 1000:9.3f} ms  pin {pin:2}  {'on' if level else 'off'}")
+    elif args.command == "set":
+        timeline = json.loads(args.json) if args.json else EXAMPLE_TIMELINE
+        save_timeline(args.path, args.slot, timeline)
+        print(f"timeline {args.slot} saved")
+    elif args.command == "delete" and not delete_timeline(args.path, args.slot):
+        print(f"timeline {args.slot} is empty")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Edit SequencerOutputDevice timeline presets")
+
+    parser.add_argument("--path", default=TIMELINES_PATH, help="preset file, app.py picks up changes on the next run")
+    parser.add_argument("command", choices=["list", "show", "set", "delete"])
+    parser.add_argument("slot", type=int, nargs="?", default=1)
+    parser.add_argument("json", nargs="?", help='e.g. {"pulses": [[12, 0, 12], [7, 310, 312]]}, the example if omitted')
+
+    args = parser.parse_args()
+
+    main(args)
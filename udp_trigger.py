@@ -0,0 +1,33 @@
+import argparse
+import time
+
+from libs.device.network import RELEASE, SHUTTER, UdpTriggerSender
+
+
+def main(args: argparse.Namespace) -> None:
+    sender = UdpTriggerSender(args.host, args.port, repeat=args.repeat)
+
+    if args.rate:
+        achieved = sender.blast(args.rate, args.count)
+        print(f"sent {args.count} packets to {args.host}:{args.port}, {achieved:.0f} packets/s")
+    else:
+        sender.send(SHUTTER)
+        time.sleep(args.hold / 1000)
+        sender.send(RELEASE)
+
+    sender.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send trigger packets to UdpInputDevice")
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--repeat", type=int, default=1, help="send every packet this many times")
+    parser.add_argument("--hold", type=int, default=100, help="ms between shutter and release")
+    parser.add_argument("--rate", type=int, default=0, help="load test: packets per second")
+    parser.add_argument("--count", type=int, default=10000, help="load test: number of packets")
+
+    args = parser.parse_args()
+
+    main(args)